@@ -1,57 +1,43 @@
 import pygame
 import os
-from config import TILE_SIZE, COLORS, LOCATIONS
+from concurrent.futures import ThreadPoolExecutor
+import atlas
+from config import TILE_SIZE, COLORS, LOCATIONS, ASSET_LOADER_THREADS
 
 class AssetManager:
+    """Sprites and sounds, loaded on a thread pool while the game is already running.
+
+    start_loading() installs placeholder surfaces right away and queues the files on
+    the pool, whose workers only read and decode them. poll(), called once per frame,
+    hands the finished ones to the main thread, which converts them for the display
+    and swaps them in. Rarely needed assets (the light mask, the location sounds)
+    are not queued at all until something first asks for them.
+    """
     def __init__(self):
         self.sprites = {}
         self.sounds = {}
         self.base_path = "assets"
+        self.pool = None
+        self.pending = {}    # future -> callback that installs its result on the main thread
+        self.requested = set()
+        self.lazy = {"light": "light_mask"}  # Sprite name -> image file, decoded on first use
+        self.total = 0
+        self.done = 0
+        self.generation = 0  # Bumped whenever a sprite is swapped in, so caches built from placeholders redraw
+
+    def _fallback_tile(self, color):
+        s = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        s.fill(color)
+        return s
 
-    def _load_animation(self, name, fallback_color):
-        frames = []
-        path = os.path.join(self.base_path, "sprites", name)
-        
-        if not os.path.exists(path):
-            s = pygame.Surface((TILE_SIZE, TILE_SIZE))
-            s.fill(fallback_color)
-            return [s]
-
-        start_index = 1 if os.path.exists(os.path.join(path, f"{name}_1.png")) else 0
-        i = start_index
-        while True:
-            file_path = os.path.join(path, f"{name}_{i}.png")
-            if os.path.exists(file_path):
-                try:
-                    img = pygame.image.load(file_path).convert_alpha()
-                    frames.append(pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE)))
-                    i += 1
-                except pygame.error:
-                    break
-            else:
-                break
-        
-        if not frames:
-            s = pygame.Surface((TILE_SIZE, TILE_SIZE))
-            s.fill(fallback_color)
-            return [s]
-            
-        return frames
-
-    def _load_image(self, name, fallback_color=None):
+    def _decode_image(self, name, scale=True):
+        """Worker thread: the decoded image, scaled to a tile unless told otherwise, or None."""
         path = os.path.join(self.base_path, "sprites", f"{name}.png")
         try:
-            img = pygame.image.load(path).convert_alpha()
-            # The light mask is a special case, we don't scale it like a tile
-            if name != "light_mask":
-                 return pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-            return img
+            img = pygame.image.load(path)
         except (pygame.error, FileNotFoundError): # Correctly catch the error
-            if fallback_color:
-                s = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                s.fill(fallback_color)
-                return s
             return None
+        return pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE)) if scale else img
 
     def _create_placeholder_light(self):
         s = pygame.Surface((300, 300), pygame.SRCALPHA)
@@ -62,41 +48,114 @@ class AssetManager:
             pygame.draw.circle(s, color, (150, 150), r)
         return s
 
-    def load_all(self):
-        # Sprites
-        self.sprites["grass"] = self._load_animation("grass", COLORS["fallback_grass"])
-        self.sprites["water_sea"] = self._load_animation("water_sea", COLORS["fallback_sea"])
-        self.sprites["water_fresh"] = self._load_animation("water_fresh", COLORS["fallback_fresh"])
-        self.sprites["dirt"] = self._load_image("ground", COLORS["fallback_dirt"])
-        
-        # This block is now robust and will not crash
-        light_img = self._load_image("light_mask")
-        self.sprites["light"] = light_img if light_img else self._create_placeholder_light()
-
-        # Sounds
+    # --- BACKGROUND LOADING ---
+    def _submit(self, fn, install, *args):
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(ASSET_LOADER_THREADS, thread_name_prefix="assets")
+        self.pending[self.pool.submit(fn, *args)] = install
+        self.total += 1
+
+    def start_loading(self):
+        """Installs placeholders and starts decoding the startup assets in the background."""
+        for name, fallback in (("grass", "fallback_grass"), ("water_sea", "fallback_sea"), ("water_fresh", "fallback_fresh")):
+            self.sprites[name] = [self._fallback_tile(COLORS[fallback])]
+        self.sprites["dirt"] = self._fallback_tile(COLORS["fallback_dirt"])
+        self.sprites["light"] = self._create_placeholder_light()
+
+        # Sprites: the tile animations are frames of one cached atlas
+        self._submit(atlas.read, self._install_animations, self.base_path)
+        self._submit(self._decode_image, lambda img: self._install_sprite("dirt", img), "ground")
+
+        # Sounds: only the ambience heard everywhere; the others wait until they are in earshot
         try:
-            pygame.mixer.set_num_channels(16)
-            for sound_name in ["nature", "market", "beach"]:
-                path = os.path.join(self.base_path, "sounds", f"{sound_name}.wav")
-                if os.path.exists(path):
-                    self.sounds[sound_name] = pygame.mixer.Sound(path)
-                    self.sounds[sound_name].play(-1).set_volume(0)
-            
-            if "nature" in self.sounds:
-                self.sounds["nature"].set_volume(0.2)
+            if pygame.mixer.get_init():
+                pygame.mixer.set_num_channels(16)
+                self._request_sound("nature")
         except Exception as e:
             print(f"Could not initialize sounds: {e}")
 
-    def update_ambient_sounds(self, player_pos):
+    def poll(self):
+        """Main thread: installs whatever the workers have finished. Returns True while loading."""
+        for future in [f for f in self.pending if f.done()]:
+            install = self.pending.pop(future)
+            self.done += 1
+            try:
+                install(future.result())
+            except Exception as e:
+                print(f"Could not load asset: {e}")
+        return bool(self.pending)
+
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    def load_all(self):
+        """Loads everything, lazy sprites included, and blocks until done. For tools and benchmarks."""
+        self.start_loading()
+        for name in list(self.lazy):
+            self.sprite(name)
+        while self.pending:
+            for future in list(self.pending):
+                future.exception()  # Waits without raising; poll() reports failures
+            self.poll()
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _install_animations(self, result):
+        animations = atlas.cut(*result)
+        for name in ("grass", "water_sea", "water_fresh"):
+            if animations.get(name):
+                self.sprites[name] = animations[name]
+        self.generation += 1
+
+    def _install_sprite(self, name, img):
+        if img is None: return  # Keep the placeholder
+        self.sprites[name] = img.convert_alpha() if pygame.display.get_surface() else img
+        self.generation += 1
+
+    def sprite(self, name):
+        """sprites[name], queueing a lazy sprite's real image on first use."""
+        file_name = self.lazy.pop(name, None)
+        if file_name:
+            # The light mask is a special case, we don't scale it like a tile
+            self._submit(self._decode_image, lambda img: self._install_sprite(name, img), file_name, False)
+        return self.sprites[name]
+
+    # --- SOUNDS ---
+    def _request_sound(self, name):
+        if name in self.requested: return
+        self.requested.add(name)
+        path = os.path.join(self.base_path, "sounds", f"{name}.wav")
+        if os.path.exists(path):
+            self._submit(pygame.mixer.Sound, lambda sound: self._install_sound(name, sound), path)
+
+    def _install_sound(self, name, sound):
+        self.sounds[name] = sound
+        sound.play(-1).set_volume(0.2 if name == "nature" else 0)
+
+    def update_ambient_sounds(self, player_pos, tilemap=None):
         if not player_pos or not pygame.mixer.get_init(): return
 
-        def dist_vol(rect):
-            d = ((player_pos.x - rect.centerx)**2 + (player_pos.y - rect.centery)**2)**0.5
+        def falloff(d):
             if d < 100: return 0.6
             if d > 900: return 0.0
             return 0.6 * (1 - (d / 900))
 
-        if "market" in self.sounds and "MARKET" in LOCATIONS:
-            self.sounds["market"].set_volume(dist_vol(LOCATIONS["MARKET"]))
-        if "beach" in self.sounds and "DOCKS" in LOCATIONS:
-            self.sounds["beach"].set_volume(dist_vol(LOCATIONS["DOCKS"]))
+        def dist_vol(rect):
+            return falloff(((player_pos.x - rect.centerx)**2 + (player_pos.y - rect.centery)**2)**0.5)
+
+        volumes = {}
+        if "MARKET" in LOCATIONS:
+            volumes["market"] = dist_vol(LOCATIONS["MARKET"])
+        # Waves are heard along the whole coastline, not just at the docks
+        if tilemap:
+            volumes["beach"] = falloff(tilemap.sea_distance(player_pos.x, player_pos.y) * TILE_SIZE)
+        elif "DOCKS" in LOCATIONS:
+            volumes["beach"] = dist_vol(LOCATIONS["DOCKS"])
+
+        for name, volume in volumes.items():
+            if name in self.sounds:
+                self.sounds[name].set_volume(volume)
+            elif volume > 0:
+                self._request_sound(name)
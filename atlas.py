@@ -0,0 +1,128 @@
+"""Sprite atlas cache for the tile animations.
+
+The grass and water animations are hundreds of small PNGs. Decoding and scaling them
+one by one dominated startup, so they are packed once into a single atlas whose raw
+RGBA pixels are cached on disk; later launches read that file in one go and cut the
+frames out as subsurfaces. The cache is rebuilt whenever TILE_SIZE or any source
+file's size or mtime changes.
+
+    python atlas.py     # (re)build the cache ahead of time
+"""
+import json
+import math
+import os
+import struct
+import pygame
+from config import TILE_SIZE, ATLAS_ANIMATIONS, ATLAS_CACHE_PATH
+
+MAGIC = b"FSAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")  # magic, version, json metadata length
+
+def animation_files(base_path, name):
+    """The frame files of one animation in play order: name_1.png, name_2.png, ... (or from _0)."""
+    path = os.path.join(base_path, "sprites", name)
+    try:
+        entries = {e.name: e for e in os.scandir(path)}
+    except OSError:
+        return []
+    i = 1 if f"{name}_1.png" in entries else 0
+    files = []
+    while f"{name}_{i}.png" in entries:
+        files.append(entries[f"{name}_{i}.png"])
+        i += 1
+    return files
+
+def source_key(base_path, animations=ATLAS_ANIMATIONS):
+    """What the cache was built from: tile size plus every frame file's name, size and mtime."""
+    key = {"tile_size": TILE_SIZE, "files": {}}
+    for name in animations:
+        files = []
+        for entry in animation_files(base_path, name):
+            st = entry.stat()
+            files.append([entry.name, st.st_size, st.st_mtime_ns])
+        key["files"][name] = files
+    return key
+
+def build(base_path, key=None, cache_path=None):
+    """Decodes, scales and packs every frame. Writes the cache and returns (atlas, layout, cols)."""
+    key = key or source_key(base_path)
+    cache_path = cache_path or os.path.join(base_path, ATLAS_CACHE_PATH)
+    frames, layout = [], {}
+    for name, files in key["files"].items():
+        start = len(frames)
+        for file_name, _, _ in files:
+            try:
+                img = pygame.image.load(os.path.join(base_path, "sprites", name, file_name))
+            except pygame.error:
+                break  # Same as the per-file loader: stop at the first unreadable frame
+            # Copying onto a blank SRCALPHA surface needs no display, unlike convert_alpha(),
+            # so the atlas can be built by `python atlas.py` or on a loader thread
+            frame = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+            frame.blit(img, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            frames.append(pygame.transform.scale(frame, (TILE_SIZE, TILE_SIZE)))
+        layout[name] = [start, len(frames) - start]
+
+    cols = max(1, math.ceil(math.sqrt(len(frames))))
+    rows = max(1, math.ceil(len(frames) / cols))
+    atlas = pygame.Surface((cols * TILE_SIZE, rows * TILE_SIZE), pygame.SRCALPHA)
+    for k, frame in enumerate(frames):
+        # MAX onto the cleared atlas copies the pixels, alpha included, instead of blending them
+        atlas.blit(frame, ((k % cols) * TILE_SIZE, (k // cols) * TILE_SIZE), special_flags=pygame.BLEND_RGBA_MAX)
+
+    meta = json.dumps({"key": key, "layout": layout, "cols": cols, "size": atlas.get_size()}).encode()
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(meta)) + meta)
+            f.write(pygame.image.tostring(atlas, "RGBA"))
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"Could not write sprite atlas cache: {e}")
+    return atlas, layout, cols
+
+def load_cached(base_path, key, cache_path=None):
+    """(atlas, layout, cols) from the cache if it was built from exactly `key`, else None."""
+    cache_path = cache_path or os.path.join(base_path, ATLAS_CACHE_PATH)
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        magic, version, meta_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION: return None
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_len])
+    except (OSError, struct.error, ValueError):
+        return None
+    if meta["key"] != key: return None
+    size = tuple(meta["size"])
+    pixels = memoryview(data)[HEADER.size + meta_len:]
+    if len(pixels) != size[0] * size[1] * 4: return None
+    atlas = pygame.image.frombuffer(pixels, size, "RGBA")
+    return atlas, meta["layout"], meta["cols"]
+
+def read(base_path):
+    """(atlas, layout, cols) from the cache when it is fresh, else freshly built. Safe off the main thread."""
+    key = source_key(base_path)
+    return load_cached(base_path, key) or build(base_path, key)
+
+def cut(atlas, layout, cols):
+    """{animation name: [frame subsurfaces]}, converted for the display. Main thread only."""
+    if pygame.display.get_surface():
+        atlas = atlas.convert_alpha()  # Also copies the pixels out of the file buffer
+    else:
+        atlas = atlas.copy()
+    animations = {}
+    for name, (start, count) in layout.items():
+        animations[name] = [atlas.subsurface(((k % cols) * TILE_SIZE, (k // cols) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+                            for k in range(start, start + count)]
+    return animations
+
+def load(base_path):
+    """{animation name: [frame subsurfaces]} for ATLAS_ANIMATIONS, from the cache when it is fresh."""
+    return cut(*read(base_path))
+
+if __name__ == "__main__":
+    import sys
+    base = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    _, layout, _ = build(base)
+    print(f"Packed {sum(n for _, n in layout.values())} frames into {os.path.join(base, ATLAS_CACHE_PATH)}")
@@ -0,0 +1,78 @@
+import os
+import queue
+import threading
+import time
+import journal
+from config import SAVE_PATH, AUTOSAVE_INTERVAL, AUTOSAVE_SLOTS, AUTOSAVE_PATH
+
+def saved_at(path):
+    """When `path` was last written to: delta saves only touch its journal."""
+    try:
+        return max(os.path.getmtime(path), os.path.getmtime(journal.journal_path(path)))
+    except OSError:
+        return os.path.getmtime(path)
+
+class Autosaver:
+    """Saves without stalling the game loop.
+
+    The main thread only copies the world (or just its delta since the last save); a
+    worker thread turns the copy into columns, then encodes, compresses and writes it.
+    Autosaves rotate through AUTOSAVE_SLOTS files; status lines are handed back to the
+    main thread for the log.
+    """
+    def __init__(self, interval=AUTOSAVE_INTERVAL, slots=AUTOSAVE_SLOTS):
+        self.interval = interval
+        self.slots = slots
+        self.next_slot = 0
+        self.last_save = time.monotonic()
+        self.pending = 0
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.worker.start()
+
+    def slot_path(self, slot):
+        return AUTOSAVE_PATH.format(slot)
+
+    def latest_path(self):
+        """Most recently written save among the manual save and the autosave slots."""
+        paths = [p for p in [SAVE_PATH] + [self.slot_path(i) for i in range(self.slots)] if os.path.exists(p)]
+        return max(paths, key=saved_at) if paths else SAVE_PATH
+
+    def save_now(self, world, path=SAVE_PATH, message="Game Saved."):
+        if not world.player_char: return
+        self.pending += 1
+        self.last_save = time.monotonic()
+        self.jobs.put((world.journal.capture(world, path), path, message))
+
+    def update(self, world, autosave=True):
+        """Call once per frame: posts finished saves to the log and starts due autosaves."""
+        while True:
+            try:
+                line = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            world.interaction_log.append(line)
+
+        # Never queue a new autosave behind one that is still being written
+        if autosave and self.interval and not self.pending and time.monotonic() - self.last_save >= self.interval:
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % self.slots
+            self.save_now(world, self.slot_path(slot), f"Autosaved (slot {slot + 1}).")
+
+    def close(self):
+        """Finishes queued saves and stops the worker."""
+        self.jobs.put(None)
+        self.worker.join()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None: return
+            save, path, message = job
+            try:
+                journal.write(path, save)
+                self.results.put(message)
+            except (OSError, ValueError) as e:
+                self.results.put(f"Save failed: {e}")
@@ -0,0 +1,147 @@
+"""Runs many independent towns across all cores and tabulates how they turned out.
+
+    python batch.py --runs 64 --days 2
+    python batch.py --runs 32 --days 5 --skip --set jobs.Farmer=2,4 --set schedule.CHAT_CHANCE=0.005,0.01
+
+Each --set KEY=V1,V2,... adds a swept parameter; every combination is run --runs times
+with seeds 0..runs-1. `jobs.<Job>` changes job_openings, anything else names a module
+constant (e.g. schedule.CHAT_CHANCE) that is patched inside the worker. Workers only
+send back a small dict of statistics, never the World itself.
+"""
+import argparse
+import ast
+import collections
+import csv
+import importlib
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from config import JOB_OPENINGS
+from relations import STATUSES
+
+STATUS_ORDER = list(STATUSES)
+ACTS = ["Chat", "Flirt", "Insult"]
+
+def simulate(job):
+    """Worker: builds one town, runs it and returns its summary statistics."""
+    openings, patched = dict(JOB_OPENINGS), []
+    for key, value in job["overrides"].items():
+        module, name = key.split(".", 1)
+        if module == "jobs":
+            openings[name] = value
+        else:
+            module = importlib.import_module(module)
+            patched.append((module, name, getattr(module, name)))
+            setattr(module, name, value)
+    try:
+        return _simulate(job, openings)
+    finally:
+        # Workers are reused, so the next run must start from the stock constants
+        for module, name, value in patched:
+            setattr(module, name, value)
+
+def _simulate(job, openings):
+    from world import World
+    from headless import DEFAULT_PLAYER, run
+
+    start = time.perf_counter()
+    world = World(seed=job["seed"])
+    world.create_new(DEFAULT_PLAYER, population=job["population"], job_openings=openings)
+    if job["skip"]:
+        world.skip_days(job["days"])
+    else:
+        run(world, days=job["days"])
+
+    n = len(world.chars)
+    statuses = collections.Counter(status for _, _, _, _, status in world.relationship_rows())
+    statuses["Strangers"] += n * (n - 1) - sum(statuses.values())
+    suitability = collections.defaultdict(list)
+    for c in world.chars:
+        if c.job != "Unemployed": suitability[c.job].append(c.get_job_suitability(c.job))
+    return {
+        "label": job["label"], "seed": job["seed"], "chars": n, "days": job["days"],
+        "statuses": dict(statuses), "acts": dict(world.interaction_counts),
+        "suitability": sum(map(sum, suitability.values())) / max(1, sum(map(len, suitability.values()))),
+        "unemployed": sum(c.job == "Unemployed" for c in world.chars),
+        "seconds": time.perf_counter() - start,
+    }
+
+def aggregate(results):
+    """Averages the per-run statistics of every parameter combination into one table row each."""
+    groups = collections.defaultdict(list)
+    for r in results:
+        groups[r["label"]].append(r)
+    rows = []
+    for label, runs in sorted(groups.items()):
+        mean = lambda values: sum(values) / len(runs)
+        pairs = [r["chars"] * (r["chars"] - 1) or 1 for r in runs]
+        row = {"config": label, "runs": len(runs)}
+        for act in ACTS:
+            row[f"{act.lower()}/char/day"] = mean(r["acts"].get(act, 0) / r["chars"] / r["days"] for r in runs)
+        for status in STATUS_ORDER:
+            row[f"%{status}"] = 100 * mean(r["statuses"].get(status, 0) / p for r, p in zip(runs, pairs))
+        row["suitability"] = mean(r["suitability"] for r in runs)
+        row["unemployed"] = mean(r["unemployed"] for r in runs)
+        row["sec/run"] = mean(r["seconds"] for r in runs)
+        rows.append(row)
+    return rows
+
+def print_table(rows):
+    if not rows: return
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3g}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  ".join(v.rjust(w) for v, w in zip(r, widths)))
+
+def parse_sweep(specs):
+    """["jobs.Farmer=2,4"] -> {"jobs.Farmer": [2, 4]}"""
+    sweep = {}
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        if "." not in key or not values:
+            sys.exit(f"bad --set {spec!r}, expected MODULE.NAME=V1,V2,...")
+        sweep[key] = [ast.literal_eval(v) for v in values.split(",")]
+    return sweep
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FantasySim Monte Carlo batch runner")
+    parser.add_argument("--runs", type=int, default=os.cpu_count(), help="towns per parameter combination")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--skip", action="store_true", help="jump the days analytically instead of ticking")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=V1,V2", help="parameter to sweep")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--csv", help="also write the table to this CSV file")
+    args = parser.parse_args(argv)
+
+    sweep = parse_sweep(args.set)
+    jobs = []
+    for values in itertools.product(*sweep.values()):
+        overrides = dict(zip(sweep, values))
+        label = " ".join(f"{k}={v}" for k, v in overrides.items()) or "default"
+        for seed in range(args.runs):
+            jobs.append({"label": label, "seed": seed, "overrides": overrides, "days": args.days,
+                         "population": args.population, "skip": args.skip})
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        results = []
+        for result in pool.imap_unordered(simulate, jobs):
+            results.append(result)
+            print(f"\r{len(results)}/{len(jobs)} runs", end="", file=sys.stderr, flush=True)
+    print(f"\r{len(jobs)} runs on {args.workers} workers in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    rows = aggregate(results)
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+if __name__ == "__main__":
+    main()
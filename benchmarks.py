@@ -0,0 +1,195 @@
+"""Benchmarks for the simulation and rendering hot paths, emitted as JSON.
+
+    python benchmarks.py                                  # every benchmark, populations 16..16384
+    python benchmarks.py --populations 16,256 --only sim,save --out bench.json
+    python benchmarks.py --seeds 0,1,2 --ticks 500
+
+Rendering runs offscreen on SDL's dummy video driver. Every result row carries the
+benchmark name, population, seed and its metrics; the "meta" block records the commit
+and library versions so runs can be compared across commits.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keeps stdout pure JSON
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import pygame
+import movement
+from config import SCREEN_W, SCREEN_H
+from world import World
+from headless import DEFAULT_PLAYER
+from social import process_interaction, process_interactions
+from assets import AssetManager
+from drawing import draw_viewport, draw_lighting, RenderTargets, LightMap
+from chunk_cache import ChunkCache
+
+BENCHMARKS = ("sim", "social", "render", "save", "assets")
+ZOOMS = (1.0, 2.0, 3.0)
+
+def _ms(seconds, n=1):
+    return round(seconds / n * 1000, 4)
+
+# --- BENCHMARKS ---
+def bench_sim(world, ticks):
+    for _ in range(min(20, ticks)):
+        world.update(1, "GOD")
+    start = time.perf_counter()
+    for _ in range(ticks):
+        world.update(1, "GOD")
+    elapsed = time.perf_counter() - start
+    return {"ticks": ticks, "ticks_per_sec": round(ticks / elapsed, 2), "ms_per_tick": _ms(elapsed, ticks)}
+
+def bench_social(world, seed, n_pairs=5000):
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < n_pairs and len(world.chars) > 1:
+        a, b = rng.sample(world.chars, 2)
+        pairs.append((a, b))
+    start = time.perf_counter()
+    for a, b in pairs:
+        process_interaction(a, b, rng=rng)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    process_interactions(pairs, world.relations, rng)
+    batched = time.perf_counter() - start
+    return {"pairs": len(pairs), "per_pair_per_sec": round(len(pairs) / single, 1),
+            "batched_per_sec": round(len(pairs) / batched, 1)}
+
+def bench_render(world, screen, assets, frames):
+    world.time_of_day = 0  # Night, so lighting does its full work
+    cache, light_map, targets = ChunkCache(), LightMap(), RenderTargets()
+    zooms = {}
+    for zoom in ZOOMS:
+        viewport = targets.begin(screen, zoom, (world.map_w, world.map_h))
+        vw, vh = viewport.get_size()
+        max_x, max_y = max(0, world.map_w - vw), max(0, world.map_h - vh)
+        viewport_time = lighting_time = present_time = 0.0
+        for f in range(frames + 5):
+            # Pan diagonally across the map so chunks and light layers get exercised
+            camera = (f * 7 % (max_x + 1), f * 5 % (max_y + 1))
+            t0 = time.perf_counter()
+            viewport = targets.begin(screen, zoom, (world.map_w, world.map_h))
+            draw_viewport(viewport, world, assets, camera, f, None, chunk_cache=cache)
+            t1 = time.perf_counter()
+            draw_lighting(viewport, world, assets, camera, light_map)
+            t2 = time.perf_counter()
+            targets.present(screen)
+            t3 = time.perf_counter()
+            if f >= 5:  # The first frames fill the caches
+                viewport_time += t1 - t0
+                lighting_time += t2 - t1
+                present_time += t3 - t2
+        zooms[str(zoom)] = {"draw_viewport_ms": _ms(viewport_time, frames),
+                            "draw_lighting_ms": _ms(lighting_time, frames),
+                            "present_ms": _ms(present_time, frames)}
+    return {"frames": frames, "zoom": zooms}
+
+def bench_save(world):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.fsim")
+        start = time.perf_counter()
+        world.save(path, full=True)
+        full = time.perf_counter() - start
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        world.save(path)
+        delta = time.perf_counter() - start
+        journal_size = os.path.getsize(path + ".journal")
+        loaded = World(seed=0)
+        start = time.perf_counter()
+        ok = loaded.load(path)
+        load = time.perf_counter() - start
+    return {"save_full_ms": _ms(full), "save_delta_ms": _ms(delta), "load_ms": _ms(load),
+            "snapshot_bytes": size, "journal_bytes": journal_size, "loaded": ok}
+
+def bench_assets(repeat=3):
+    times = []
+    for _ in range(repeat):
+        assets = AssetManager()
+        start = time.perf_counter()
+        assets.load_all()
+        times.append(time.perf_counter() - start)
+        assets.close()
+    return {"load_all_ms": _ms(min(times)), "load_all_mean_ms": _ms(sum(times), repeat)}
+
+# --- HARNESS ---
+def meta():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"commit": commit, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "pygame": pygame.version.ver, "numpy": movement.np.__version__ if movement.available() else None}
+
+def run(populations, seeds, only, ticks, frames, vectorized=False):
+    # Assets are looked up relative to the working directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    assets = AssetManager()
+    assets.load_all()
+
+    results = []
+    def record(name, population, seed, fn):
+        print(f"{name:7} population={population} seed={seed}", file=sys.stderr, flush=True)
+        row = {"bench": name, "population": population, "seed": seed}
+        try:
+            row.update(fn())
+        except MemoryError as e:
+            row["error"] = f"MemoryError: {e}"
+        results.append(row)
+
+    if "assets" in only:
+        record("assets", None, None, bench_assets)
+    for population in populations:
+        for seed in seeds:
+            world = World(vectorized=vectorized, seed=seed)
+            start = time.perf_counter()
+            world.create_new(DEFAULT_PLAYER, population=population)
+            print(f"created {population} characters in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+            # Fewer ticks for big towns keeps a full run within minutes
+            n_ticks = max(10, ticks * 256 // max(256, population))
+            if "sim" in only: record("sim", population, seed, lambda: bench_sim(world, n_ticks))
+            if "social" in only: record("social", population, seed, lambda: bench_social(world, seed))
+            if "render" in only: record("render", population, seed, lambda: bench_render(world, screen, assets, frames))
+            if "save" in only: record("save", population, seed, lambda: bench_save(world))
+            del world
+    return {"meta": meta(), "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FantasySim benchmarks")
+    parser.add_argument("--populations", default="16,256,4096,16384")
+    parser.add_argument("--seeds", default="0")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma list of " + ", ".join(BENCHMARKS))
+    parser.add_argument("--ticks", type=int, default=1000, help="World.update ticks at population <= 256")
+    parser.add_argument("--frames", type=int, default=60, help="frames per zoom level")
+    parser.add_argument("--numpy", action="store_true", help="use the vectorized movement engine")
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(","))
+    unknown = only - set(BENCHMARKS)
+    if unknown: parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    report = run([int(p) for p in args.populations.split(",")], [int(s) for s in args.seeds.split(",")],
+                 only, args.ticks, args.frames, args.numpy)
+    report["meta"]["args"] = vars(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
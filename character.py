@@ -1,5 +1,18 @@
 import random
-from config import RACES, MBTI_TYPES, JOBS_PRIMARY_STAT, LOCATIONS, INN_BAR_AREA, PATROL_POINTS, RANCH, FIELDS
+from config import RACES, MBTI_TYPES, JOBS_PRIMARY_STAT, LOCATIONS, INN_BAR_AREA, PATROL_POINTS, RANCH, FIELDS, TILE_SIZE
+from tilemap import SEA
+
+PHASE_STARTS = (300, 850, 1100)  # work, evening, sleep; in schedule-shifted time of day
+
+def day_phase(t):
+    if t >= 1100 or t < 300: return "sleep"
+    if t < 850: return "work"
+    return "evening"
+
+MOVEMENT_FIELDS = ("x", "y", "target_x", "target_y", "speed")
+
+def _movement_field(field):
+    return property(lambda self: self._get(field), lambda self, value: self._set(field, value))
 
 class Relationship:
     def __init__(self):
@@ -8,22 +21,28 @@ class Relationship:
         self.status = "Strangers"
 
 class Character:
-    def __init__(self, name, x, y, color):
+    # Position, target and speed are plain attributes. While the world runs the
+    # vectorized movement engine the character becomes a VectorCharacter, which keeps
+    # them in its row of the engine's arrays instead, so the scalar path pays nothing.
+    # Likewise relationships live in the world's RelationshipStore (row `id`) when bound.
+    def __init__(self, name, x, y, color, rng=random):
+        self._rows, self._row = None, None
+        self._relations, self.id = None, None
         self.name = name
         self.color = color
         self.is_player = False
         
-        self.race = random.choice(RACES)
-        self.mbti = random.choice(MBTI_TYPES)
+        self.race = rng.choice(RACES)
+        self.mbti = rng.choice(MBTI_TYPES)
         self.job = "Unemployed"
         
         self.stats = {}
         self.relationships = {}
-        self.recalculate_stats()
+        self.recalculate_stats(rng)
         
         self.job_state = { "task": "Idle", "path": [], "path_index": 0, "boat_active": False }
         self.daily_routine = 0
-        self.schedule_offset = random.randint(-40, 40)
+        self.schedule_offset = rng.randint(-40, 40)
         
         self.chat_text = None
         self.chat_timer = 0
@@ -35,43 +54,93 @@ class Character:
         self.work_coords = (0, 0)
         self.speed = 2
 
-    def update(self, world, game_mode, process_interaction):
-        if self.chat_timer > 0:
-            self.chat_timer -= 1
+    def _bind_movement(self, rows, row):
+        """Moves position, target and speed into `rows`, which already holds their values."""
+        for f in MOVEMENT_FIELDS: del self.__dict__[f]
+        self._rows, self._row = rows, row
+        self.__class__ = VectorCharacter
+
+    def _set_boat_active(self, active):
+        self.job_state["boat_active"] = active
+        if self._rows is not None: self._rows.boat[self._row] = active
+
+    def _bind_relations(self, store, row):
+        self._relations, self.id = store, row
 
-        if self.is_player and game_mode == "NORMAL":
-            return 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for f in MOVEMENT_FIELDS:
+            state[f] = getattr(self, f)
+        state["_rows"], state["_row"] = None, None
+        if self._relations is not None:
+            state["relationships"] = {**self.relationships, **self._relations.row(self.id)}
+        state["_relations"], state["id"] = None, None
+        return state
 
-        self._update_ai_behavior(world, process_interaction)
-        self.move()
+    def __reduce_ex__(self, protocol):
+        # Always pickled as a plain Character, whichever engine it is bound to
+        return object.__new__, (Character,), self.__getstate__()
 
-    def _update_ai_behavior(self, world, process_interaction):
-        self.job_state["boat_active"] = False
+    def __setstate__(self, state):
+        # Saves made while these were stored as underscored attributes
+        for f in MOVEMENT_FIELDS:
+            if "_" + f in state: state[f] = state.pop("_" + f)
+        state.setdefault("_rows", None)
+        state.setdefault("_row", None)
+        state.setdefault("_relations", None)
+        state.setdefault("id", None)
+        self.__dict__.update(state)
+
+    def plan(self, world):
+        """Picks the destination for the schedule phase this character is in right now."""
+        self._set_boat_active(False)
         self.job_state["task"] = "Idle"
-        
-        time = world.time_of_day + self.schedule_offset
-        dest = self.home_coords
+        phase = day_phase(world.time_of_day + self.schedule_offset)
+        jitter = 20
 
-        if time > 1100 or time < 300:
+        if phase == "sleep":
             dest = self.bed_coords
-        elif 300 <= time < 850:
+        elif phase == "work":
             self.job_state["task"] = "Working"
-            dest = self._get_work_destination()
+            dest = self._get_work_destination(world)
+            if self.job == "Farmer" and self.daily_routine != 2:
+                jitter = 0  # Path waypoints have to be reached exactly
         else:
             dest = INN_BAR_AREA.center if self.stats["social"] > 5 else self.home_coords
 
-        self.target_x = dest[0] + random.randint(-20, 20)
-        self.target_y = dest[1] + random.randint(-20, 20)
-        
-        if random.random() < 0.005:
-            for other in world.chars:
-                if self != other and ((self.x - other.x)**2 + (self.y - other.y)**2)**0.5 < 40:
-                    act, line = process_interaction(self, other)
-                    self.say(line)
-                    world.interaction_log.append(f"{self.name}: {line}")
-                    break
-
-    def _get_work_destination(self):
+        self.target_x = dest[0] + world.rng.randint(-jitter, jitter)
+        self.target_y = dest[1] + world.rng.randint(-jitter, jitter)
+
+    def time_until_next_phase(self, time_of_day):
+        t = time_of_day + self.schedule_offset
+        for start in PHASE_STARTS:
+            if start > t: return start - t
+        return PHASE_STARTS[0] + 1200 - t
+
+    def needs_job_tick(self):
+        if self.job_state["task"] != "Working": return False
+        if self.job == "Farmer": return self.daily_routine != 2
+        return self.job == "Fisher" and self.daily_routine == 0
+
+    def follow_job(self, world):
+        """Per-tick upkeep for jobs that react to where the character is. True if the target changed."""
+        if self.job == "Fisher":
+            self._set_boat_active(self._near_sea(world))
+            return False
+
+        path = self.job_state["path"]
+        wx, wy = path[self.job_state["path_index"]]
+        if ((self.x - wx)**2 + (self.y - wy)**2)**0.5 < 10:
+            self.job_state["path_index"] = (self.job_state["path_index"] + 1) % len(path)
+            self.target_x, self.target_y = path[self.job_state["path_index"]]
+            return True
+        return False
+
+    def _near_sea(self, world):
+        # Boats launch one tile before open water
+        return world.tilemap.tile_at(self.x, self.y + TILE_SIZE) == SEA
+
+    def _get_work_destination(self, world):
         if self.job == "Farmer":
             field_idx = 0 if self.daily_routine == 0 else 1
             if self.daily_routine == 2:
@@ -91,8 +160,8 @@ class Character:
             return PATROL_POINTS[self.daily_routine % len(PATROL_POINTS)]
         elif self.job == "Fisher":
             if self.daily_routine == 0:
-                self.job_state["boat_active"] = (self.y > 1150)
-                return (random.randint(200, 800), 1400)
+                self._set_boat_active(self._near_sea(world))
+                return (world.rng.randint(200, 800), 1400)
             elif self.daily_routine == 1:
                 return (LOCATIONS["DOCKS"].x + 50, LOCATIONS["DOCKS"].y + 350)
             else:
@@ -124,12 +193,12 @@ class Character:
         if loc_name and loc_name in LOCATIONS:
             self.work_coords = LOCATIONS[loc_name].center
 
-    def roll_daily_routine(self):
-        self.daily_routine = random.randint(0, 2)
+    def roll_daily_routine(self, rng=random):
+        self.daily_routine = rng.randint(0, 2)
         if self.job == "Farmer": self.job_state["path"] = []
 
-    def recalculate_stats(self):
-        self.stats = {k: random.randint(3, 8) for k in ["social", "intellect", "strength", "joy", "libido", "work_ethic"]}
+    def recalculate_stats(self, rng=random):
+        self.stats = {k: rng.randint(3, 8) for k in ["social", "intellect", "strength", "joy", "libido", "work_ethic"]}
         if self.race == "Orc": self.stats["strength"] += 3
         elif self.race == "Elf": self.stats["intellect"] += 3
         elif self.race == "Halfling": self.stats["social"] += 3
@@ -150,28 +219,41 @@ class Character:
         return score
 
     def get_relationship(self, other_name):
+        store = self._relations
+        if store is not None and other_name in store.ids:
+            return store.view(self.id, store.ids[other_name])
         if other_name not in self.relationships:
             self.relationships[other_name] = Relationship()
         return self.relationships[other_name]
 
+    def relationship_with(self, other):
+        """get_relationship for a Character, skipping the name lookup when both share a store."""
+        if self._relations is not None and other._relations is self._relations:
+            return self._relations.view(self.id, other.id)
+        return self.get_relationship(other.name)
+
     def say(self, text):
         self.chat_text = text
         self.chat_timer = 180
 
-    def move(self):
-        dx, dy = self.target_x - self.x, self.target_y - self.y
+    def move(self, scale=1):
+        """Steps towards the target, `scale` ticks' worth at once. Returns True once it is reached."""
+        x, y, tx, ty = self.x, self.y, self.target_x, self.target_y
+        dx, dy = tx - x, ty - y
         dist = (dx**2 + dy**2)**0.5
         
         actual_speed = self.speed * 2 if self.job_state.get("boat_active") else self.speed
+        actual_speed *= scale
         if dist > actual_speed:
-            self.x += (dx / dist) * actual_speed
-            self.y += (dy / dist) * actual_speed
-        else:
-            self.x, self.y = self.target_x, self.target_y
+            self.x = x + (dx / dist) * actual_speed
+            self.y = y + (dy / dist) * actual_speed
+            return False
+        self.x, self.y = tx, ty
+        return True
 
     def get_known_info(self, observer):
         if observer == self: return self.get_full_info()
-        rel = observer.get_relationship(self.name)
+        rel = observer.relationship_with(self)
         info = {"name": self.name, "job": "???", "mbti": "???", "race": self.race, "status": rel.status}
         if rel.friendship > 0 or rel.romance > 0 or self.job_state.get("task") == "Working":
             info["job"] = self.job
@@ -181,3 +263,23 @@ class Character:
 
     def get_full_info(self):
         return {"name": self.name, "job": self.job, "mbti": self.mbti, "race": self.race, "status": "Self"}
+
+class VectorCharacter(Character):
+    """A Character bound to a VectorMovement: position, target and speed live in its row of the arrays."""
+    x = _movement_field("x")
+    y = _movement_field("y")
+    target_x = _movement_field("target_x")
+    target_y = _movement_field("target_y")
+    speed = _movement_field("speed")
+
+    def _get(self, field):
+        return float(getattr(self._rows, field)[self._row])
+
+    def _set(self, field, value):
+        getattr(self._rows, field)[self._row] = value
+
+    def _unbind_movement(self):
+        values = {f: self._get(f) for f in MOVEMENT_FIELDS}
+        self._rows, self._row = None, None
+        self.__class__ = Character
+        self.__dict__.update(values)
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import math
+import pygame
+from config import TILE_SIZE
+from drawing import draw_terrain, draw_structures
+from tilemap import GRASS, SEA, FRESH
+
+CHUNK_TILES = 8
+REBUILDS_PER_FRAME = 2
+OVERLAY_KEY = (255, 0, 255)  # Transparent colour of the structure overlays
+ANIM_PERIOD = 40  # Frames after which the water (every 5) and grass (every 8) steps line up again
+
+class ChunkCache:
+    """Terrain and static structures pre-composited into large chunk surfaces.
+
+    A chunk is keyed by its position plus the animation frame of each animated layer
+    it actually contains, so it is only redrawn when one of those frames advances and
+    drawing the map costs a handful of big blits per frame. Structures are drawn once
+    per chunk onto a colour-keyed overlay, so a redraw is the tiles plus one blit.
+
+    Each chunk runs its animations on a clock offset by its position, so the visible
+    chunks advance on different frames, and at most `rebuilds_per_frame` chunks are
+    drawn per frame; stale ones past that keep their previous frame a little longer.
+    """
+    def __init__(self, max_chunks=32, chunk_tiles=CHUNK_TILES, rebuilds_per_frame=REBUILDS_PER_FRAME):
+        self.chunk_size = chunk_tiles * TILE_SIZE
+        self.max_chunks = max_chunks
+        self.rebuilds_per_frame = rebuilds_per_frame
+        self.chunks = OrderedDict()  # (cx, cy) -> (anim key, surface, frame built), least recently used first
+        self.layers = {}             # (cx, cy) -> tile kinds present in the chunk
+        self.overlays = {}           # (cx, cy) -> structures over the chunk, or None where there are none
+
+    def clear(self):
+        self.chunks.clear()
+        self.layers.clear()
+        self.overlays.clear()
+
+    def _layers(self, game_world, cx, cy):
+        key = (cx, cy)
+        if key not in self.layers:
+            n = self.chunk_size // TILE_SIZE
+            tiles = game_world.tilemap.tiles[cy * n:(cy + 1) * n]
+            self.layers[key] = {kind for line in tiles for kind in line[cx * n:(cx + 1) * n]}
+        return self.layers[key]
+
+    def _anim_key(self, layers, assets, frame_count):
+        return (
+            assets.generation,  # Chunks drawn with placeholder tiles redraw once the real ones arrive
+            (frame_count // 5) % len(assets.sprites["water_sea"]) if SEA in layers else None,
+            (frame_count // 5) % len(assets.sprites["water_fresh"]) if FRESH in layers else None,
+            (frame_count // 8) % len(assets.sprites["grass"]) if GRASS in layers else None,
+        )
+
+    def _overlay(self, cx, cy, size):
+        if (cx, cy) not in self.overlays:
+            overlay = pygame.Surface(size)
+            if pygame.display.get_surface(): overlay = overlay.convert()
+            overlay.fill(OVERLAY_KEY)
+            draw_structures(overlay, (cx * self.chunk_size, cy * self.chunk_size))
+            overlay.set_colorkey(OVERLAY_KEY, pygame.RLEACCEL)
+            self.overlays[(cx, cy)] = overlay if overlay.get_bounding_rect().w else None
+        return self.overlays[(cx, cy)]
+
+    def _clock(self, cx, cy, frame_count):
+        """The chunk's own animation clock, so neighbouring chunks step on different frames."""
+        return frame_count + (cx * 7 + cy * 13) % ANIM_PERIOD
+
+    def _build(self, game_world, assets, cx, cy, anim, clock, frame_count, surf=None):
+        if surf is None:
+            cs = self.chunk_size
+            w = min(cs, game_world.map_w - cx * cs)
+            h = min(cs, game_world.map_h - cy * cs)
+            surf = pygame.Surface((w, h))
+            if pygame.display.get_surface(): surf = surf.convert()
+
+        origin = (cx * self.chunk_size, cy * self.chunk_size)
+        draw_terrain(surf, game_world, assets, origin, clock)
+        overlay = self._overlay(cx, cy, surf.get_size())
+        if overlay: surf.blit(overlay, (0, 0))
+
+        self.chunks[(cx, cy)] = (anim, surf, frame_count)
+        return surf
+
+    def draw(self, surface, game_world, assets, camera, frame_count):
+        vw, vh = surface.get_size()
+        # Snap to whole pixels once so neighbouring chunks never leave a seam
+        cam_x, cam_y = math.floor(camera[0]), math.floor(camera[1])
+        cs = self.chunk_size
+        first_cx, first_cy = int(max(0, cam_x) // cs), int(max(0, cam_y) // cs)
+        last_cx = int(min(game_world.map_w - 1, cam_x + vw) // cs)
+        last_cy = int(min(game_world.map_h - 1, cam_y + vh) // cs)
+
+        visible, stale, budget = [], [], self.rebuilds_per_frame
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                clock = self._clock(cx, cy, frame_count)
+                anim = self._anim_key(self._layers(game_world, cx, cy), assets, clock)
+                entry = self.chunks.get((cx, cy))
+                if entry is None:
+                    self._build(game_world, assets, cx, cy, anim, clock, frame_count)  # Nothing to show yet
+                    budget -= 1
+                elif entry[0] != anim:
+                    stale.append((entry[2], cx, cy, anim, clock))
+                self.chunks.move_to_end((cx, cy))
+                visible.append((cx, cy))
+
+        # Redraw in place the chunks that have waited longest; the others keep their old frame
+        stale.sort()
+        for _, cx, cy, anim, clock in stale[:max(0, budget)]:
+            self._build(game_world, assets, cx, cy, anim, clock, frame_count, self.chunks[(cx, cy)][1])
+
+        for cx, cy in visible:
+            surface.blit(self.chunks[(cx, cy)][1], (cx * cs - cam_x, cy * cs - cam_y))
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
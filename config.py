@@ -1,4 +1,4 @@
-import pygame
+from collections import namedtuple
 
 # --- DISPLAY ---
 SCREEN_W, SCREEN_H = 1200, 800
@@ -8,6 +8,28 @@ TILE_SIZE = 64
 # --- WORLD ---
 MAP_W, MAP_H = 2400, 1800
 TIME_SPEED = 0.017
+SAVE_PATH = "savegame.fsim"
+LEGACY_SAVE_PATH = "savegame.pkl"  # Old pickle saves, still imported by World.load
+AUTOSAVE_PATH = "autosave_{}.fsim"
+AUTOSAVE_INTERVAL = 120  # Seconds of play between background autosaves, 0 to disable
+AUTOSAVE_SLOTS = 3
+JOURNAL_MAX_RECORDS = 50  # Delta saves appended to a journal before the next full snapshot
+# Level of detail: characters within LOD_NEAR_MARGIN px of the view are simulated every tick,
+# those within LOD_FAR_MARGIN every LOD_COARSE_EVERY ticks with bigger steps, the rest teleport
+LOD_NEAR_MARGIN = 200
+LOD_FAR_MARGIN = 800
+LOD_COARSE_EVERY = 4
+PROFILER_WINDOW = 240  # Frames kept for the profiler overlay and its percentiles
+PROFILER_CAPTURE_FRAMES = 300  # Frames recorded per trace (F7) or cProfile (F8) capture
+ATLAS_ANIMATIONS = ("grass", "water_sea", "water_fresh")  # Packed into one cached sprite atlas
+ATLAS_CACHE_PATH = "cache/sprites.atlas"  # Relative to the assets folder
+ASSET_LOADER_THREADS = 4  # Threads decoding sprites and sounds in the background
+LOG_CAPACITY = 200  # Interaction log lines kept in memory
+LOG_FILE = None  # e.g. "interactions.log.gz" to stream the full log to disk
+LOG_ROTATE_BYTES = 8 * 1024 * 1024  # Uncompressed bytes per log file before it rotates
+LOG_ROTATE_FILES = 5  # Rotated log files kept (path.1 ... path.N)
+MAP_FILE = None  # Optional text tile map (see tilemap.py); None builds the map below
+VECTOR_MOVEMENT = False  # NumPy structure-of-arrays movement, for very large towns
 
 # --- COLORS ---
 COLORS = {
@@ -33,36 +55,60 @@ COLORS = {
 }
 
 # --- FONTS ---
-pygame.font.init()
-FONTS = {
-    "default": pygame.font.SysFont("Tahoma", 14),
-    "bubble": pygame.font.SysFont("Tahoma", 12, bold=True),
-    "header": pygame.font.SysFont("Tahoma", 20, bold=True),
-    "menu": pygame.font.SysFont("Tahoma", 24),
+FONT_SPECS = {
+    "default": ("Tahoma", 14),
+    "bubble": ("Tahoma", 12, True),
+    "header": ("Tahoma", 20, True),
+    "menu": ("Tahoma", 24),
 }
 
+class FontRegistry(dict):
+    """FONTS[name] builds the SysFont on first access, so headless runs never load pygame.font."""
+    def __missing__(self, name):
+        import pygame
+        if not pygame.font.get_init(): pygame.font.init()
+        font = self[name] = pygame.font.SysFont(*FONT_SPECS[name])
+        return font
+
+FONTS = FontRegistry()
+
+# --- GEOMETRY ---
+class MapRect(namedtuple("MapRect", "x y w h")):
+    """The read-only subset of pygame.Rect the map data needs, as a plain tuple."""
+    __slots__ = ()
+    left = property(lambda r: r.x)
+    top = property(lambda r: r.y)
+    right = property(lambda r: r.x + r.w)
+    bottom = property(lambda r: r.y + r.h)
+    centerx = property(lambda r: r.x + r.w // 2)
+    centery = property(lambda r: r.y + r.h // 2)
+    center = property(lambda r: (r.x + r.w // 2, r.y + r.h // 2))
+
+    def collidepoint(self, x, y):
+        return self.x <= x < self.x + self.w and self.y <= y < self.y + self.h
+
 # --- MAP DATA (FIXED AGAIN) ---
 LOCATIONS = {
-    "INN": pygame.Rect(1000, 600, 300, 250),
-    "MARKET": pygame.Rect(950, 900, 400, 300),
-    "BLACKSMITH": pygame.Rect(1400, 600, 200, 200),
-    "GUILD": pygame.Rect(1400, 850, 200, 200),
-    "DOCKS": pygame.Rect(100, 1300, 300, 400),
-    "FARM": pygame.Rect(1720, 100, 580, 600),
-    "GUARD_POST": pygame.Rect(950, 300, 150, 150),
-    "PARK": pygame.Rect(300, 600, 400, 400)
+    "INN": MapRect(1000, 600, 300, 250),
+    "MARKET": MapRect(950, 900, 400, 300),
+    "BLACKSMITH": MapRect(1400, 600, 200, 200),
+    "GUILD": MapRect(1400, 850, 200, 200),
+    "DOCKS": MapRect(100, 1300, 300, 400),
+    "FARM": MapRect(1720, 100, 580, 600),
+    "GUARD_POST": MapRect(950, 300, 150, 150),
+    "PARK": MapRect(300, 600, 400, 400)
 }
-INN_BAR_AREA = pygame.Rect(1020, 750, 260, 80)
-HOUSES = [pygame.Rect(100 + i * 150, 100, 120, 120) for i in range(5)] + \
-         [pygame.Rect(100 + i * 150, 300, 120, 120) for i in range(5)]
+INN_BAR_AREA = MapRect(1020, 750, 260, 80)
+HOUSES = [MapRect(100 + i * 150, 100, 120, 120) for i in range(5)] + \
+         [MapRect(100 + i * 150, 300, 120, 120) for i in range(5)]
 ROADS = [
-    pygame.Rect(0, 450, 2400, 80),
-    pygame.Rect(850, 0, 80, 1800),
-    pygame.Rect(0, 1250, 1000, 60),
-    pygame.Rect(1650, 0, 60, 800)
+    MapRect(0, 450, 2400, 80),
+    MapRect(850, 0, 80, 1800),
+    MapRect(0, 1250, 1000, 60),
+    MapRect(1650, 0, 60, 800)
 ]
-FIELDS = [pygame.Rect(1750, 150, 200, 500), pygame.Rect(2000, 150, 200, 500)]
-RANCH = pygame.Rect(2250, 150, 100, 500)
+FIELDS = [MapRect(1750, 150, 200, 500), MapRect(2000, 150, 200, 500)]
+RANCH = MapRect(2250, 150, 100, 500)
 BEDS = [(h.x + 20, h.y + 20) for h in HOUSES] + \
        [(LOCATIONS["INN"].x + 20 + (i % 3) * 60, LOCATIONS["INN"].y + 20 + (i // 3) * 60) for i in range(6)]
 LAKE_COL_START = 400 // TILE_SIZE
@@ -82,6 +128,7 @@ MBTI_TYPES = ['INTJ', 'INTP', 'ENTJ', 'ENTP', 'INFJ', 'INFP', 'ENFJ', 'ENFP',
               'ISTJ', 'ISFJ', 'ESTJ', 'ESFJ', 'ISTP', 'ISFP', 'ESTP', 'ESFP']
 RACES = ['Human', 'Elf', 'Dwarf', 'Orc', 'Goblin', 'Tiefling', 'Halfling']
 JOBS_LIST = ["Innkeeper", "Blacksmith", "Scholar", "Guard", "Merchant", "Fisher", "Farmer", "Unemployed"]
+JOB_OPENINGS = {"Innkeeper": 2, "Blacksmith": 2, "Scholar": 2, "Guard": 3, "Merchant": 2, "Fisher": 2, "Farmer": 2}
 JOBS_PRIMARY_STAT = {
     "Innkeeper": "social", "Blacksmith": "strength", "Scholar": "intellect",
     "Guard": "strength", "Merchant": "social", "Fisher": "joy", "Farmer": "work_ethic"
@@ -1,5 +1,7 @@
 import pygame
-from config import COLORS, FONTS, TILE_SIZE, LOCATIONS, ROADS, HOUSES, BEDS, LAKE_COL_START, LAKE_COL_END
+from config import COLORS, TILE_SIZE, LOCATIONS, ROADS, HOUSES, BEDS
+from tilemap import SEA, FRESH, DIRT
+from text_cache import render_text
 
 def get_sky_color(time_of_day):
     """Calculates the color of the sky based on the time of day."""
@@ -20,17 +22,17 @@ def get_sky_color(time_of_day):
         int(start[2] + (end[2] - start[2]) * prog)
     )
 
-def draw_viewport(surface, game_world, assets, camera, frame_count, selected_char):
-    """Draws the world, structures, and characters."""
-    vw, vh = surface.get_size()
-    cam_x, cam_y = camera
+def draw_terrain(surface, game_world, assets, origin, frame_count):
+    """Blits the animated ground tiles covering `surface`, whose top-left sits at world `origin`."""
+    w, h = surface.get_size()
+    ox, oy = origin
     
-    start_col = int(max(0, cam_x // TILE_SIZE))
-    end_col = int(min(game_world.map_w // TILE_SIZE, (cam_x + vw) // TILE_SIZE + 1))
-    start_row = int(max(0, cam_y // TILE_SIZE))
-    end_row = int(min(game_world.map_h // TILE_SIZE, (cam_y + vh) // TILE_SIZE + 1))
+    tilemap = game_world.tilemap
+    start_col = int(max(0, ox // TILE_SIZE))
+    end_col = int(min(tilemap.cols, (ox + w) // TILE_SIZE + 1))
+    start_row = int(max(0, oy // TILE_SIZE))
+    end_row = int(min(tilemap.rows, (oy + h) // TILE_SIZE + 1))
 
-    # --- Draw Terrain ---
     sea_frames = assets.sprites["water_sea"]
     fresh_frames = assets.sprites["water_fresh"]
     grass_frames = assets.sprites["grass"]
@@ -40,33 +42,49 @@ def draw_viewport(surface, game_world, assets, camera, frame_count, selected_cha
     fresh_idx = (frame_count // 5) % len(fresh_frames)
 
     for row in range(start_row, end_row):
+        kinds = tilemap.tiles[row]
         for col in range(start_col, end_col):
-            x, y = col * TILE_SIZE - cam_x, row * TILE_SIZE - cam_y
-            tile_x, tile_y = col * TILE_SIZE, row * TILE_SIZE
+            x, y = col * TILE_SIZE - ox, row * TILE_SIZE - oy
+            kind = kinds[col]
             
-            if tile_y > 1200:
+            if kind == SEA:
                 surface.blit(sea_frames[sea_idx], (x, y))
-            elif LAKE_COL_START <= col < LAKE_COL_END and 550 < tile_y < 1100:
+            elif kind == FRESH:
                 surface.blit(fresh_frames[fresh_idx], (x, y))
-            elif "FARM" in LOCATIONS and LOCATIONS["FARM"].collidepoint(tile_x, tile_y):
+            elif kind == DIRT:
                 surface.blit(assets.sprites["dirt"], (x, y))
             else:
                 # CHANGED: Speed up grass animation slightly
                 grass_idx = (col + row + (frame_count // 8)) % len(grass_frames)
                 surface.blit(grass_frames[grass_idx], (x, y))
 
-    # --- Draw Structures ---
+def draw_structures(surface, origin):
+    """Draws roads, buildings, houses and beds."""
+    w, h = surface.get_size()
+    ox, oy = origin
     for r in ROADS:
-        pygame.draw.rect(surface, COLORS["road"], (r.x - cam_x, r.y - cam_y, r.w, r.h))
+        pygame.draw.rect(surface, COLORS["road"], (r.x - ox, r.y - oy, r.w, r.h))
     for name, r in LOCATIONS.items():
-        pygame.draw.rect(surface, COLORS["building"], (r.x - cam_x, r.y - cam_y, r.w, r.h))
-        surface.blit(FONTS["default"].render(name, True, COLORS["text_highlight"]), (r.x - cam_x + 10, r.y - cam_y + 10))
-    for h in HOUSES:
-        pygame.draw.rect(surface, COLORS["house"], (h.x - cam_x, h.y - cam_y, h.w, h.h))
+        pygame.draw.rect(surface, COLORS["building"], (r.x - ox, r.y - oy, r.w, r.h))
+        surface.blit(render_text("default", name, COLORS["text_highlight"]), (r.x - ox + 10, r.y - oy + 10))
+    for h_rect in HOUSES:
+        pygame.draw.rect(surface, COLORS["house"], (h_rect.x - ox, h_rect.y - oy, h_rect.w, h_rect.h))
     for bx, by in BEDS:
-        if -50 < bx - cam_x < vw and -50 < by - cam_y < vh:
-            pygame.draw.rect(surface, COLORS["bed_sheet"], (bx - cam_x, by - cam_y, 25, 40))
-            pygame.draw.rect(surface, COLORS["bed_frame"], (bx - cam_x, by - cam_y + 10, 25, 30))
+        if -50 < bx - ox < w and -50 < by - oy < h:
+            pygame.draw.rect(surface, COLORS["bed_sheet"], (bx - ox, by - oy, 25, 40))
+            pygame.draw.rect(surface, COLORS["bed_frame"], (bx - ox, by - oy + 10, 25, 30))
+
+def draw_viewport(surface, game_world, assets, camera, frame_count, selected_char, chunk_cache=None):
+    """Draws the world, structures, and characters."""
+    vw, vh = surface.get_size()
+    cam_x, cam_y = camera
+
+    # --- Draw Terrain & Structures ---
+    if chunk_cache is not None:
+        chunk_cache.draw(surface, game_world, assets, camera, frame_count)
+    else:
+        draw_terrain(surface, game_world, assets, camera, frame_count)
+        draw_structures(surface, camera)
 
     # --- Draw Characters ---
     for c in sorted(game_world.chars, key=lambda char: char.y):
@@ -81,43 +99,95 @@ def draw_viewport(surface, game_world, assets, camera, frame_count, selected_cha
             pygame.draw.circle(surface, c.color, (int(sx), int(sy)), 10)
             
             if c.chat_timer > 0 and c.chat_text:
-                txt = FONTS["bubble"].render(c.chat_text, True, COLORS["black"])
+                txt = render_text("bubble", c.chat_text, COLORS["black"])
                 bg_rect = pygame.Rect(sx, sy - 40, txt.get_width() + 8, 20)
                 pygame.draw.rect(surface, COLORS["white"], bg_rect, border_radius=5)
                 surface.blit(txt, (bg_rect.x + 4, bg_rect.y + 2))
 
-def draw_lighting(surface, game_world, assets, camera):
+class RenderTargets:
+    """Keeps the world viewport surface alive across frames.
+
+    It is only reallocated when the window is resized or the zoom changes, and at 1x
+    zoom the world is drawn straight onto the screen with no scaling pass at all.
+    """
+    def __init__(self):
+        self.viewport = None
+        self.current = None
+
+    def begin(self, screen, zoom, map_size):
+        sw, sh = screen.get_size()
+        size = (int(sw / zoom), int(sh / zoom))
+        if size == (sw, sh):
+            self.current = screen
+        else:
+            if self.viewport is None or self.viewport.get_size() != size:
+                # Same pixel format as the screen, so it can be scaled straight into it
+                self.viewport = pygame.Surface(size, 0, screen)
+            self.current = self.viewport
+        if size[0] > map_size[0] or size[1] > map_size[1]:
+            self.current.fill(COLORS["black"])  # The map does not cover the whole view
+        return self.current
+
+    def present(self, screen):
+        if self.current is not screen:
+            pygame.transform.scale(self.current, screen.get_size(), screen)
+
+class LightMap:
+    """Static building glows baked once into a world-space layer.
+
+    Only dynamic lights (fireflies) are drawn per frame, and the darkness overlay is
+    kept across frames, so a night frame allocates no surfaces.
+    """
+    def __init__(self):
+        self.darkness = None
+        self.darkness_color = None
+        self.layer = None
+        self.origin = (0, 0)
+        self.sprite = None
+        self.firefly = pygame.Surface((7, 7))
+        pygame.draw.circle(self.firefly, (180, 180, 50), (3, 3), 3)
+
+    def _bake(self, light):
+        spots = [(r.centerx - 150, r.centery - 150) for r in LOCATIONS.values()]
+        left, top = min(x for x, _ in spots), min(y for _, y in spots)
+        right = max(x for x, _ in spots) + light.get_width()
+        bottom = max(y for _, y in spots) + light.get_height()
+        self.layer = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        for x, y in spots:
+            self.layer.blit(light, (x - left, y - top))
+        self.origin = (left, top)
+        self.sprite = light
+
+    def darken(self, surface, sky_color):
+        size = surface.get_size()
+        if self.darkness is None or self.darkness.get_size() != size:
+            self.darkness = pygame.Surface(size)
+            self.darkness_color = None
+        if self.darkness_color != sky_color:
+            self.darkness.fill(sky_color)
+            self.darkness_color = sky_color
+        surface.blit(self.darkness, (0, 0), special_flags=pygame.BLEND_MULT)
+
+    def draw(self, surface, game_world, light, camera):
+        if light is not self.sprite:
+            self._bake(light)
+        cam_x, cam_y = camera
+        surface.blit(self.layer, (self.origin[0] - cam_x, self.origin[1] - cam_y), special_flags=pygame.BLEND_ADD)
+        for p in game_world.environment.particles:
+            surface.blit(self.firefly, (int(p[0] - cam_x) - 3, int(p[1] - cam_y) - 3), special_flags=pygame.BLEND_ADD)
+
+def draw_lighting(surface, game_world, assets, camera, light_map=None):
     """Applies darkness and light sources to the final viewport."""
     time_of_day = game_world.time_of_day
     # No lighting effects needed during the day
     if 350 <= time_of_day < 750:
         return
 
-    vw, vh = surface.get_size()
-    cam_x, cam_y = camera
-    
-    # 1. Create the darkness overlay
-    sky_color = get_sky_color(time_of_day)
-    darkness = pygame.Surface((vw, vh))
-    darkness.fill(sky_color)
-    
-    # 2. Darken the entire drawn scene
-    surface.blit(darkness, (0, 0), special_flags=pygame.BLEND_MULT)
-
-    # 3. Add light sources back on top if it's deep night
-    if time_of_day > 750 or time_of_day < 350:
-        # Create a blank layer for the lights
-        light_layer = pygame.Surface((vw, vh), pygame.SRCALPHA)
-        
-        # Draw building glows onto the light layer
-        for r in LOCATIONS.values():
-            lx, ly = r.centerx - cam_x, r.centery - cam_y
-            light_layer.blit(assets.sprites["light"], (lx - 150, ly - 150))
-        
-        # Draw fireflies onto the light layer
-        for p in game_world.environment.particles:
-            px, py = p[0] - cam_x, p[1] - cam_y
-            pygame.draw.circle(light_layer, (180, 180, 50), (int(px), int(py)), 3)
-            
-        # 4. Add the lights to the darkened scene
-        surface.blit(light_layer, (0, 0), special_flags=pygame.BLEND_ADD)
+    if light_map is None:
+        light_map = LightMap()
+
+    # 1. Darken the entire drawn scene
+    light_map.darken(surface, get_sky_color(time_of_day))
+
+    # 2. Add the baked building glows and the fireflies back on top
+    light_map.draw(surface, game_world, assets.sprite("light"), camera)
@@ -0,0 +1,78 @@
+"""Runs the town simulation without a window, as fast as the CPU allows.
+
+    python headless.py --days 7
+    python headless.py --ticks 100000 --population 256
+    python headless.py --days 30 --log interactions.log.gz
+    python headless.py --days 2 --seed 42 --trace 10000   # reproducible; digest every 10000 ticks
+"""
+import argparse
+import time
+from world import World
+from interaction_log import LogSink
+
+DEFAULT_PLAYER = {"name": "Player", "race_idx": 0, "job_idx": 3, "mbti_idx": 0}
+
+def run(world, ticks=None, days=None, game_speed=1, game_mode="GOD", chunk=1000, trace=None):
+    """Steps the world for a number of ticks or until `days` have passed. Returns ticks run.
+
+    With `trace`, prints the world digest every `trace` ticks for golden-trace comparisons.
+    """
+    done = 0
+    if ticks is not None:
+        while done < ticks:
+            step = min(chunk, ticks - done)
+            if trace: step = min(step, trace - done % trace)
+            done += world.step(step, game_speed, game_mode)
+            if trace and done % trace == 0: print(f"tick {done} {world.digest()}")
+    else:
+        end_day = world.day + days
+        while world.day < end_day:
+            done += world.step(1, game_speed, game_mode)
+            if trace and done % trace == 0: print(f"tick {done} {world.digest()}")
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless FantasySim runner")
+    length = parser.add_mutually_exclusive_group()
+    length.add_argument("--ticks", type=int, help="number of fixed ticks to simulate")
+    length.add_argument("--days", type=int, help="number of in-game days to simulate")
+    parser.add_argument("--skip", action="store_true",
+                        help="jump --days ahead analytically with World.skip_days instead of ticking")
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--numpy", action="store_true", help="use the vectorized movement engine")
+    parser.add_argument("--speed", type=int, default=1, help="game speed multiplier per tick")
+    parser.add_argument("--seed", type=int, help="seed the world's RNG for a reproducible run")
+    parser.add_argument("--trace", type=int, metavar="N", help="print the world digest every N ticks")
+    parser.add_argument("--log", help="also stream the full interaction log to this rotating .gz file")
+    parser.add_argument("--mode", default="GOD", choices=["GOD", "NORMAL"],
+                        help="GOD lets the AI drive the player character too")
+    args = parser.parse_args(argv)
+    if args.ticks is None and args.days is None:
+        args.days = 1
+
+    world = World(vectorized=args.numpy, seed=args.seed)
+    if args.log:
+        world.interaction_log.sink = LogSink(args.log)
+    world.create_new(DEFAULT_PLAYER, population=args.population)
+
+    start = time.perf_counter()
+    if args.skip and args.days:
+        world.skip_days(args.days)
+        elapsed = time.perf_counter() - start
+        print(f"Skipped {args.days} days for {len(world.chars)} characters in {elapsed * 1000:.1f}ms")
+        print(world.interaction_log.tail(1)[0])
+        print(f"Digest {world.digest()}")
+        world.interaction_log.close()
+        return
+    ticks = run(world, args.ticks, args.days, args.speed, args.mode, trace=args.trace)
+    elapsed = time.perf_counter() - start
+    world.interaction_log.close()
+
+    print(f"Simulated {ticks} ticks for {len(world.chars)} characters in {elapsed:.2f}s "
+          f"({ticks / max(elapsed, 1e-9):.0f} ticks/sec)")
+    print(f"World is at day {world.day}, time {world.time_of_day:.1f}, "
+          f"{world.interaction_log.total} log lines")
+    print(f"Digest {world.digest()}")
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,12 @@ class InputHandler:
             
             self.mouse_pos = pygame.mouse.get_pos()
 
+            # Profiling works in every screen
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F6: return "PROFILER_OVERLAY"
+                if event.key == pygame.K_F7: return "PROFILER_TRACE"
+                if event.key == pygame.K_F8: return "PROFILER_CPROFILE"
+
             if self.game_state.current == "MENU":
                 action = self.handle_menu_input(event)
             elif self.game_state.current == "CREATION":
@@ -0,0 +1,70 @@
+import collections
+import gzip
+import os
+from config import LOG_CAPACITY, LOG_ROTATE_BYTES, LOG_ROTATE_FILES
+
+class LogSink:
+    """Streams log lines to a gzip file, rotating it to path.1, path.2, ... once it grows too big."""
+    def __init__(self, path, max_bytes=LOG_ROTATE_BYTES, keep=LOG_ROTATE_FILES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.file = None
+        self.written = 0
+
+    def write(self, line):
+        if self.file is None:
+            self.file = gzip.open(self.path, "at", encoding="utf-8")
+            self.written = 0
+        self.file.write(line + "\n")
+        self.written += len(line) + 1
+        if self.written >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        self.close()
+        stale = f"{self.path}.{self.keep}"
+        if os.path.exists(stale):
+            os.remove(stale)
+        for i in range(self.keep - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class InteractionLog:
+    """The last `capacity` log lines for the UI, plus an optional sink that keeps all of them."""
+    def __init__(self, capacity=LOG_CAPACITY, sink=None):
+        self.lines = collections.deque(maxlen=capacity)
+        self.sink = sink
+        self.total = 0
+
+    def append(self, line):
+        self.lines.append(line)
+        self.total += 1
+        if self.sink is not None:
+            self.sink.write(line)
+
+    def tail(self, n):
+        """The newest n lines, oldest first."""
+        n = min(n, len(self.lines))
+        return [self.lines[i] for i in range(len(self.lines) - n, len(self.lines))]
+
+    def clear(self, line=None):
+        self.lines.clear()
+        if line is not None: self.append(line)
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
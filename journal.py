@@ -0,0 +1,191 @@
+"""Append-only journal of world deltas written between full snapshots.
+
+Homes, beds, jobs and stats rarely change between saves; positions, the clock and
+relationship values do. A journaled save appends one small record with the current
+clock and positions plus whatever relationships, jobs and days changed since the
+previous save, and loading replays the records on top of the snapshot. Every
+JOURNAL_MAX_RECORDS saves a fresh snapshot is written and the journal restarts.
+
+Record layout: a u32 length, then a zlib-compressed body. The journal starts with a
+header naming the snapshot it extends, so a stale journal is never replayed.
+"""
+import os
+import struct
+import zlib
+import savefile
+from config import JOBS_LIST, JOURNAL_MAX_RECORDS
+
+JOURNAL_MAGIC = b"FSJL"
+JOURNAL_HEADER = struct.Struct("<4sIdQ")      # magic, snapshot day, time, ticks
+RECORD_HEADER = struct.Struct("<IdQiIIII")    # day, time, ticks, player, chars, rels, jobs, days
+LENGTH = struct.Struct("<I")
+
+def journal_path(save_path):
+    return save_path + ".journal"
+
+class Changes:
+    """What changed since one save path was last written."""
+    __slots__ = ("relationships", "jobs", "days")
+
+    def __init__(self):
+        self.relationships = {}  # (actor, target) -> None
+        self.jobs = {}           # char -> None
+        self.days = []           # (day, [daily_routine per char])
+
+class Journal:
+    """Tracks what changed since the last save of each path, on the main thread.
+
+    Every save path keeps its own pending Changes: autosave slots and the manual save
+    are written at different times, so a delta appended to one must not drop changes
+    another path has not seen yet.
+    """
+    def __init__(self):
+        self.saved = {}    # save path -> [snapshot token, records appended since]
+        self.pending = {}  # save path -> Changes since that path was last written
+
+    def reset(self):
+        """Forgets all pending changes and known snapshots, e.g. for a brand-new world."""
+        self.saved.clear()
+        self.pending.clear()
+
+    def mark_relationship(self, actor, target):
+        for changes in self.pending.values():
+            changes.relationships[(actor, target)] = None
+            changes.relationships[(target, actor)] = None
+
+    def mark_job(self, char):
+        for changes in self.pending.values():
+            changes.jobs[char] = None
+
+    def mark_day(self, world):
+        if not self.pending: return
+        day = (world.day, [c.daily_routine for c in world.chars])
+        for changes in self.pending.values():
+            changes.days.append(day)
+
+    def require_full(self):
+        self.reset()
+
+    def capture(self, world, path, full=False):
+        """Snapshots the state a save of `path` needs: ("full", snapshot) or ("delta", record)."""
+        info = self.saved.get(path)
+        if full or info is None or info[1] >= JOURNAL_MAX_RECORDS:
+            snap = savefile.capture(world)
+            self.saved[path] = [(snap["day"], snap["time"], snap["ticks"]), 0]
+            self.pending[path] = Changes()
+            return "full", snap
+
+        changes, self.pending[path] = self.pending[path], Changes()
+        index = {c: i for i, c in enumerate(world.chars)}
+        statuses, rels = [], {name: [] for name, _ in savefile.REL_SCHEMA}
+        for actor, target in changes.relationships:
+            if actor not in index or target not in index: continue
+            rel = actor.relationship_with(target)
+            if rel.status not in statuses: statuses.append(rel.status)
+            rels["i"].append(index[actor]); rels["j"].append(index[target])
+            rels["friendship"].append(rel.friendship); rels["romance"].append(rel.romance)
+            rels["status"].append(statuses.index(rel.status))
+        delta = {
+            "day": world.day, "time": world.time_of_day, "ticks": world.ticks,
+            "player_idx": index.get(world.player_char, -1),
+            "x": [c.x for c in world.chars], "y": [c.y for c in world.chars],
+            "rels": rels, "statuses": statuses,
+            "jobs": [(index[c], JOBS_LIST.index(c.job)) for c in changes.jobs if c in index],
+            "days": changes.days,
+        }
+        info[1] += 1
+        return "delta", delta
+
+    def replay(self, world, path):
+        """Applies the journal of `path` on top of the snapshot just loaded into `world`."""
+        jpath = journal_path(path)
+        if not os.path.exists(jpath): return 0
+        with open(jpath, "rb") as f:
+            data = f.read()
+        token = (world.day, world.time_of_day, world.ticks)
+        if len(data) < JOURNAL_HEADER.size: return 0
+        magic, *snap_token = JOURNAL_HEADER.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC or tuple(snap_token) != token: return 0
+
+        offset, count = JOURNAL_HEADER.size, 0
+        while offset + LENGTH.size <= len(data):
+            (size,) = LENGTH.unpack_from(data, offset)
+            body = data[offset + LENGTH.size:offset + LENGTH.size + size]
+            if len(body) < size: break  # Torn final write: keep everything before it
+            _apply(world, decode_delta(zlib.decompress(body)))
+            offset += LENGTH.size + size
+            count += 1
+        self.saved[path] = [token, count]
+        self.pending[path] = Changes()
+        return count
+
+def encode_delta(delta):
+    n = len(delta["x"])
+    rels = delta["rels"]
+    parts = [RECORD_HEADER.pack(delta["day"], delta["time"], delta["ticks"], delta["player_idx"],
+                                n, len(rels["i"]), len(delta["jobs"]), len(delta["days"])),
+             savefile.pack_array("d", delta["x"]), savefile.pack_array("d", delta["y"]),
+             struct.pack("<I", len(delta["statuses"])), savefile.pack_strings(delta["statuses"])]
+    for name, typecode in savefile.REL_SCHEMA:
+        parts.append(savefile.pack_array(typecode, rels[name]))
+    parts.append(savefile.pack_array("I", [i for i, _ in delta["jobs"]]))
+    parts.append(savefile.pack_array("B", [job for _, job in delta["jobs"]]))
+    for day, routines in delta["days"]:
+        parts.append(struct.pack("<I", day) + savefile.pack_array("B", routines))
+    return b"".join(parts)
+
+def decode_delta(body):
+    body = memoryview(body)
+    day, time_of_day, ticks, player_idx, n, n_rels, n_jobs, n_days = RECORD_HEADER.unpack_from(body, 0)
+    offset = RECORD_HEADER.size
+    xs, offset = savefile.unpack_array("d", body, offset, n)
+    ys, offset = savefile.unpack_array("d", body, offset, n)
+    (n_statuses,) = struct.unpack_from("<I", body, offset)
+    statuses, offset = savefile.unpack_strings(body, offset + 4, n_statuses)
+    rels = {}
+    for name, typecode in savefile.REL_SCHEMA:
+        rels[name], offset = savefile.unpack_array(typecode, body, offset, n_rels)
+    job_idx, offset = savefile.unpack_array("I", body, offset, n_jobs)
+    job_codes, offset = savefile.unpack_array("B", body, offset, n_jobs)
+    days = []
+    for _ in range(n_days):
+        (d,) = struct.unpack_from("<I", body, offset)
+        routines, offset = savefile.unpack_array("B", body, offset + 4, n)
+        days.append((d, routines))
+    return {"day": day, "time": time_of_day, "ticks": ticks, "player_idx": player_idx, "x": xs, "y": ys,
+            "rels": rels, "statuses": statuses, "jobs": list(zip(job_idx, job_codes)), "days": days}
+
+def _apply(world, delta):
+    chars = world.chars
+    for day, routines in delta["days"]:
+        for c, routine in zip(chars, routines):
+            c.daily_routine = routine
+            if c.job == "Farmer": c.job_state["path"] = []
+    for i, job in delta["jobs"]:
+        chars[i].job = JOBS_LIST[job]
+        chars[i].assign_work_coords()
+    rels, statuses = delta["rels"], delta["statuses"]
+    for i, j, f, r, s in zip(rels["i"], rels["j"], rels["friendship"], rels["romance"], rels["status"]):
+        rel = chars[i].get_relationship(chars[j].name)
+        rel.friendship, rel.romance, rel.status = f, r, statuses[s]
+    for c, x, y in zip(chars, delta["x"], delta["y"]):
+        c.x = c.target_x = x
+        c.y = c.target_y = y
+    for i, c in enumerate(chars):
+        c.is_player = i == delta["player_idx"]
+    world.player_char = chars[delta["player_idx"]] if delta["player_idx"] >= 0 else None
+    world.day, world.time_of_day, world.ticks = delta["day"], delta["time"], delta["ticks"]
+
+def write(path, job):
+    """Performs a save captured by Journal.capture. Safe to call from a worker thread."""
+    kind, payload = job
+    jpath = journal_path(path)
+    if kind == "full":
+        savefile.write_atomic(path, savefile.encode(savefile.snapshot(payload)))
+        savefile.write_atomic(jpath, JOURNAL_HEADER.pack(JOURNAL_MAGIC, payload["day"], payload["time"], payload["ticks"]))
+        return
+    record = zlib.compress(encode_delta(payload), 1)
+    with open(jpath, "ab") as f:
+        f.write(LENGTH.pack(len(record)) + record)
+        f.flush()
+        os.fsync(f.fileno())
@@ -4,8 +4,10 @@ from assets import AssetManager
 from world import World
 from ui import UIManager
 from input_handler import InputHandler
-from social import process_interaction
-from drawing import draw_viewport, draw_lighting
+from drawing import draw_viewport, draw_lighting, LightMap, RenderTargets
+from chunk_cache import ChunkCache
+from autosave import Autosaver
+from profiler import FrameProfiler
 
 class GameState:
     def __init__(self):
@@ -33,7 +35,12 @@ class Game:
         pygame.display.set_caption("Fantasy Sim: Refactored")
         
         self.assets = AssetManager()
+        self.chunk_cache = ChunkCache()
+        self.light_map = LightMap()
+        self.render_targets = RenderTargets()
         self.world = World()
+        self.autosaver = Autosaver()
+        self.profiler = FrameProfiler()
         self.state = GameState()
         self.ui = UIManager((self.state.screen_w, self.state.screen_h))
         self.input_handler = InputHandler(self.state)
@@ -43,23 +50,35 @@ class Game:
         self.running = True
 
     def run(self):
-        self.assets.load_all()
+        self.assets.start_loading()
         
+        prof = self.profiler
         while self.running:
             self.clock.tick(FPS)
+            prof.begin_frame()
             self.frame_count += 1
             
             action = self.input_handler.handle_events(pygame.event.get())
             if action:
                 self.handle_action(action)
+            prof.lap("input")
             
             if self.state.current == "GAME":
-                self.world.update(self.state.speed, self.state.mode)
-                self.assets.update_ambient_sounds(self.world.player_char)
+                self.world.update(self.state.speed, self.state.mode, self.view_rect())
+                prof.lap("world")
+                self.assets.update_ambient_sounds(self.world.player_char, self.world.tilemap)
                 self.update_camera()
+            self.assets.poll()
+            self.autosaver.update(self.world, autosave=self.state.current == "GAME")
+            prof.lap("misc")
 
             self.draw()
+            message = prof.end_frame()
+            if message: self.world.interaction_log.append(message)
             
+        self.autosaver.close()
+        self.assets.close()
+        self.world.interaction_log.close()
         pygame.quit()
 
     def handle_action(self, action_data):
@@ -75,7 +94,7 @@ class Game:
         # Game State
         if action_type == "NEW_GAME": self.state.current = "CREATION"
         if action_type == "LOAD_GAME":
-            if self.world.load(): self.state.current = "GAME"
+            if self.world.load(self.autosaver.latest_path()): self.state.current = "GAME"
         if action_type == "GOTO_MENU": self.state.current = "MENU"
         
         if action_type == "CREATION_CHANGE": self.update_creation_data(action_value)
@@ -92,7 +111,10 @@ class Game:
                 self.state.speed = 0
                 self.state.current = "PAUSE"
         
-        if action_type == "SAVE_GAME": self.world.save()
+        if action_type == "SAVE_GAME": self.autosaver.save_now(self.world)
+        if action_type == "PROFILER_OVERLAY": self.profiler.visible = not self.profiler.visible
+        if action_type == "PROFILER_TRACE": self.world.interaction_log.append(self.profiler.start_trace())
+        if action_type == "PROFILER_CPROFILE": self.world.interaction_log.append(self.profiler.start_profile())
         if action_type == "TOGGLE_GOD_MODE":
             self.state.mode = "GOD" if self.state.mode == "NORMAL" else "NORMAL"
         
@@ -109,7 +131,7 @@ class Game:
         if action_type == "GOD_EXIT_EDITOR": self.state.mode = "GOD"
             
         if self.state.selected_char:
-            if action_type == "GOD_REROLL": self.state.selected_char.recalculate_stats()
+            if action_type == "GOD_REROLL": self.world.reroll_stats(self.state.selected_char)
             if action_type == "GOD_POSSESS":
                 if self.world.player_char: self.world.player_char.is_player = False
                 self.state.selected_char.is_player = True
@@ -118,12 +140,8 @@ class Game:
 
         # Interaction Menu
         if action_type == "INTERACT":
-            closest = min(
-                (c for c in self.world.chars if c != self.world.player_char),
-                key=lambda c: (self.world.player_char.x - c.x)**2 + (self.world.player_char.y - c.y)**2,
-                default=None
-            )
-            if closest and ((self.world.player_char.x - closest.x)**2 + (self.world.player_char.y - closest.y)**2)**0.5 < 60:
+            closest = self.world.nearest_char(self.world.player_char, 60)
+            if closest:
                 self.state.player_target = closest
                 self.state.interaction_selection = 0
 
@@ -134,9 +152,8 @@ class Game:
                 self.state.player_target = None
             elif self.state.player_target:
                 actor, target = self.world.player_char, self.state.player_target
-                act, line = process_interaction(actor, target, choice)
-                actor.say(line)
-                self.world.interaction_log.append(f"You ({act}): {line}")
+                act, line = self.world.interact(actor, target, choice)
+                self.world.speak(actor, line, f"You ({act}): {line}")
                 self.state.player_target = None
 
     def update_creation_data(self, direction):
@@ -179,6 +196,11 @@ class Game:
         if keys[pygame.K_a] or keys[pygame.K_LEFT]: self.state.camera[0] -= cam_speed
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]: self.state.camera[0] += cam_speed
 
+    def view_rect(self):
+        """The part of the map on screen, in world coordinates."""
+        return (self.state.camera[0], self.state.camera[1],
+                self.state.screen_w / self.state.zoom, self.state.screen_h / self.state.zoom)
+
     def update_camera(self):
         if self.state.mode == "NORMAL" and self.world.player_char:
             target_x = self.world.player_char.x - (self.state.screen_w / self.state.zoom / 2)
@@ -191,15 +213,18 @@ class Game:
         self.state.camera[1] = max(0, min(self.state.camera[1], self.world.map_h - vh))
 
     def draw(self):
+        prof = self.profiler
         if self.state.current in ["GAME", "PAUSE", "EDITOR"]:
-            viewport_size = (int(self.state.screen_w / self.state.zoom), int(self.state.screen_h / self.state.zoom))
-            viewport = pygame.Surface(viewport_size)
+            viewport = self.render_targets.begin(self.screen, self.state.zoom, (self.world.map_w, self.world.map_h))
             
-            draw_viewport(viewport, self.world, self.assets, self.state.camera, self.frame_count, self.state.selected_char)
-            draw_lighting(viewport, self.world, self.assets, self.state.camera)
+            draw_viewport(viewport, self.world, self.assets, self.state.camera, self.frame_count, self.state.selected_char,
+                          chunk_cache=self.chunk_cache)
+            prof.lap("viewport")
+            draw_lighting(viewport, self.world, self.assets, self.state.camera, self.light_map)
+            prof.lap("lighting")
             
-            scaled_view = pygame.transform.scale(viewport, (self.state.screen_w, self.state.screen_h))
-            self.screen.blit(scaled_view, (0, 0))
+            self.render_targets.present(self.screen)
+            prof.lap("scale")
             
             self.ui.draw_game_ui(self.screen, self.world, self.state, self.state.selected_char, self.state.player_target)
 
@@ -207,9 +232,14 @@ class Game:
             self.ui.draw_creation_menu(self.screen, self.state.creation_data, self.state.creation_selection)
         
         else: # MENU
-            self.ui.draw_main_menu(self.screen, self.state.menu_selection)
+            self.ui.draw_main_menu(self.screen, self.state.menu_selection,
+                                   self.assets.progress() if self.assets.pending else None)
+        prof.lap("ui")
 
+        prof.draw(self.screen)
+        prof.lap("profiler")
         pygame.display.flip()
+        prof.lap("flip")
 
 if __name__ == "__main__":
     game = Game()
@@ -0,0 +1,126 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from spatial import SpatialGrid
+
+def available():
+    return np is not None
+
+class VectorMovement:
+    """Structure-of-arrays store for character movement, stepped for the whole population at once.
+
+    Characters bound to it read and write their position, target and speed through
+    their row of these arrays instead of plain attributes.
+    """
+    def __init__(self, chars):
+        n = len(chars)
+        self.chars = list(chars)
+        self.x = np.empty(n)
+        self.y = np.empty(n)
+        self.target_x = np.empty(n)
+        self.target_y = np.empty(n)
+        self.speed = np.empty(n)
+        self.boat = np.zeros(n, dtype=bool)
+        for i, c in enumerate(self.chars):
+            self.x[i], self.y[i] = c.x, c.y
+            self.target_x[i], self.target_y[i] = c.target_x, c.target_y
+            self.speed[i] = c.speed
+            self.boat[i] = bool(c.job_state.get("boat_active"))
+            c._bind_movement(self, i)
+
+    def detach(self):
+        """Copies the arrays back into the characters and unbinds them."""
+        for c in self.chars:
+            c._unbind_movement()
+        self.chars = []
+
+    def move_all(self, scale=1):
+        """Vectorized Character.move for every row. Returns the indices that changed position."""
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        dist = np.hypot(dx, dy)
+        step = np.where(self.boat, self.speed * 2, self.speed) * scale
+
+        walking = dist > step
+        scale = np.divide(step, dist, out=np.zeros_like(dist), where=walking)
+        self.x += dx * scale
+        self.y += dy * scale
+
+        arrived = ~walking
+        self.x[arrived] = self.target_x[arrived]
+        self.y[arrived] = self.target_y[arrived]
+        return np.flatnonzero(dist > 0)
+
+class VectorGrid(SpatialGrid):
+    """SpatialGrid over the characters of a VectorMovement, kept in step from its arrays.
+
+    After a move only the rows whose cell changed are re-filed. The positions stored
+    for the others go stale: position() and any_within() read the arrays instead, and
+    the other queries refresh a bucket from them the first time they read it after
+    the move.
+    """
+    def __init__(self, rows, cell_size=64):
+        super().__init__(cell_size)
+        self.rows = rows
+        self.col = self.row = None  # Cell every row was last filed in
+        self.fresh = set()          # Cells whose stored positions are current
+        self.xs = self.ys = None    # The position arrays as lists, taken once per move
+
+    def _cells(self, x, y):
+        return (x // self.cell_size).astype(np.int64), (y // self.cell_size).astype(np.int64)
+
+    def _positions(self):
+        if self.xs is None:
+            self.xs, self.ys = self.rows.x.tolist(), self.rows.y.tolist()
+        return self.xs, self.ys
+
+    def rebuild(self, chars):
+        super().rebuild(chars)
+        self.col, self.row = self._cells(self.rows.x, self.rows.y)
+        self.fresh.clear()
+        self.xs = None
+
+    def place(self, char, x, y):
+        super().place(char, x, y)
+        i = char._row
+        self.col[i], self.row[i] = self.char_cells[char]
+        if self.xs is not None:
+            self.xs[i], self.ys[i] = x, y
+
+    def moved(self, indices):
+        """Re-files the characters at `indices` (rows of the arrays) that crossed into another cell."""
+        col, row = self._cells(self.rows.x[indices], self.rows.y[indices])
+        crossed = indices[(col != self.col[indices]) | (row != self.row[indices])]
+        xs, ys = self.rows.x[crossed].tolist(), self.rows.y[crossed].tolist()
+        chars = self.rows.chars
+        for i, x, y in zip(crossed.tolist(), xs, ys):
+            SpatialGrid.place(self, chars[i], x, y)
+        self.col[indices], self.row[indices] = col, row
+        self.fresh.clear()
+        self.xs = None
+
+    def position(self, char):
+        xs, ys = self._positions()
+        return xs[char._row], ys[char._row]
+
+    def any_within(self, x, y, radius, exclude=None):
+        xs, ys = self._positions()
+        r2 = radius * radius
+        for cell in self._home_first(x, y, radius):
+            bucket = self.cells.get(cell)
+            if not bucket: continue
+            for c in bucket:
+                i = c._row
+                if c is not exclude and (xs[i] - x)**2 + (ys[i] - y)**2 < r2:
+                    return c
+        return None
+
+    def _bucket(self, cell):
+        bucket = self.cells.get(cell)
+        if bucket and cell not in self.fresh:
+            xs, ys = self._positions()
+            for c in bucket:
+                bucket[c] = (xs[c._row], ys[c._row])
+            self.fresh.add(cell)
+        return bucket
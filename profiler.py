@@ -0,0 +1,152 @@
+import cProfile
+import collections
+import json
+import pstats
+import time
+import pygame
+from config import COLORS, FONTS, PROFILER_WINDOW, PROFILER_CAPTURE_FRAMES
+
+STAGE_COLORS = [(230, 90, 90), (240, 170, 60), (230, 220, 80), (110, 200, 110),
+                (80, 180, 220), (120, 120, 240), (200, 110, 220), (170, 170, 170)]
+
+class FrameProfiler:
+    """Per-frame stage timings for the game loop.
+
+    Game.run calls begin_frame() after the frame cap wait and lap(name) after each
+    stage, so each lap costs one perf_counter() call and a deque append. Keeps the
+    last PROFILER_WINDOW frames for percentiles and the overlay graph, and can record
+    the next PROFILER_CAPTURE_FRAMES frames as a Chrome trace (chrome://tracing,
+    Perfetto) or under cProfile.
+    """
+    def __init__(self, window=PROFILER_WINDOW, capture_frames=PROFILER_CAPTURE_FRAMES):
+        self.window = window
+        self.capture_frames = capture_frames
+        self.stages = {}   # name -> deque of ms, in first-seen order
+        self.frames = collections.deque(maxlen=window)  # [(name, ms), ...] per frame
+        self.visible = False
+        self.frame = []
+        self.frame_start = self.last = time.perf_counter()
+        self.trace = None  # Chrome trace events while recording
+        self.trace_left = 0
+        self.profile = None
+        self.profile_left = 0
+        self.labels = []
+        self.labels_age = 0
+        self.panel = None
+
+    # --- TIMING ---
+    def begin_frame(self):
+        self.frame = []
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, name):
+        """Attributes the time since the previous lap (or frame start) to stage `name`."""
+        now = time.perf_counter()
+        self.frame.append((name, self.last, now))
+        self.last = now
+
+    def end_frame(self):
+        """Files the frame away. Returns a status line when a capture just finished."""
+        laps = [(name, (end - start) * 1000) for name, start, end in self.frame]
+        for name, ms in laps:
+            samples = self.stages.get(name)
+            if samples is None:
+                samples = self.stages[name] = collections.deque(maxlen=self.window)
+            samples.append(ms)
+        frame_ms = (self.last - self.frame_start) * 1000
+        self.stages.setdefault("frame", collections.deque(maxlen=self.window)).append(frame_ms)
+        self.frames.append(laps)
+
+        message = None
+        if self.trace is not None:
+            for name, start, end in self.frame:
+                self.trace.append({"name": name, "ph": "X", "pid": 0, "tid": 0,
+                                   "ts": start * 1e6, "dur": (end - start) * 1e6})
+            self.trace_left -= 1
+            if self.trace_left <= 0: message = self._finish_trace()
+        if self.profile is not None:
+            self.profile_left -= 1
+            if self.profile_left <= 0: message = self._finish_profile()
+        return message
+
+    def percentiles(self, name, qs=(50, 95, 99)):
+        samples = sorted(self.stages.get(name, ()))
+        if not samples: return [0.0] * len(qs)
+        return [samples[min(len(samples) - 1, int(len(samples) * q / 100))] for q in qs]
+
+    # --- CAPTURES ---
+    def start_trace(self):
+        if self.trace is not None: return "Trace already recording."
+        self.trace, self.trace_left = [], self.capture_frames
+        return f"Recording a trace of {self.capture_frames} frames..."
+
+    def _finish_trace(self):
+        path = time.strftime("trace_%Y%m%d_%H%M%S.json")
+        events, self.trace = self.trace, None
+        try:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            return f"Trace failed: {e}"
+        return f"Trace written to {path}"
+
+    def start_profile(self):
+        if self.profile is not None: return "Profiler already running."
+        self.profile, self.profile_left = cProfile.Profile(), self.capture_frames
+        self.profile.enable()
+        return f"Profiling {self.capture_frames} frames..."
+
+    def _finish_profile(self):
+        profile, self.profile = self.profile, None
+        profile.disable()
+        path = time.strftime("profile_%Y%m%d_%H%M%S.prof")
+        summary = path[:-len(".prof")] + ".txt"  # Top functions, readable without pstats
+        try:
+            profile.dump_stats(path)
+            with open(summary, "w") as f:
+                pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(25)
+        except OSError as e:
+            return f"Profile failed: {e}"
+        return f"Profile written to {path}, summary in {summary}"
+
+    # --- OVERLAY ---
+    def draw(self, surface):
+        if not self.visible or not self.frames: return
+        names = [n for n in self.stages if n != "frame"]
+        colors = {n: STAGE_COLORS[i % len(STAGE_COLORS)] for i, n in enumerate(names)}
+        width, graph_h, line_h = self.window, 100, 16
+        size = (width + 20, graph_h + 30 + line_h * (len(names) + 2))
+        if self.panel is None or self.panel.get_size() != size:
+            self.panel = pygame.Surface(size, pygame.SRCALPHA)
+        panel = self.panel
+        panel.fill((0, 0, 0, 180))
+
+        # Stacked bar per frame, scaled so the 33ms line sits mid-graph
+        scale = graph_h / 66.0
+        base = graph_h + 10
+        for x, laps in enumerate(self.frames):
+            y = base
+            for name, ms in laps:
+                h = ms * scale
+                if h >= 0.5:
+                    pygame.draw.line(panel, colors.get(name, COLORS["white"]), (10 + x, y), (10 + x, max(10, y - h)))
+                y -= h
+        for ms in (16.7, 33.3):
+            y = base - ms * scale
+            pygame.draw.line(panel, (255, 255, 255, 90), (10, y), (10 + width, y))
+
+        # Text changes every frame; re-render it a few times a second instead
+        self.labels_age -= 1
+        if self.labels_age <= 0 or len(self.labels) != len(names) + 2:
+            font = FONTS["default"]
+            rows = [("stage (ms)", ("p50", "p95", "p99"), COLORS["white"])]
+            for name in names + ["frame"]:
+                rows.append((name, [f"{v:.2f}" for v in self.percentiles(name)], colors.get(name, COLORS["white"])))
+            self.labels = [[font.render(text, True, color) for text in (name, *values)] for name, values, color in rows]
+            self.labels_age = 15
+        for i, cells in enumerate(self.labels):
+            y = graph_h + 20 + i * line_h
+            panel.blit(cells[0], (10, y))
+            for col, cell in enumerate(cells[1:]):
+                panel.blit(cell, (100 + col * 52, y))
+        surface.blit(panel, (surface.get_width() - panel.get_width() - 10, 10))
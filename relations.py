@@ -0,0 +1,154 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STATUSES = ["Strangers", "Enemy", "Crush", "Lover", "Bestie", "Exes"]
+
+def available():
+    return np is not None
+
+def nonzero_cells(captured):
+    """Arrays (i, j, friendship, romance, status code) of a capture's non-default cells, row by row."""
+    cells, f, r, s, _, n = captured
+    order = np.argsort(cells)
+    cells, f, r, s = cells[order], f[order], r[order], s[order]
+    keep = (f != 0) | (r != 0) | (s != 0)
+    ii, jj = np.divmod(cells[keep], n)
+    return ii, jj, f[keep], r[keep], s[keep]
+
+class RelationshipView:
+    """How one character feels about another: a window onto a row/column of the store."""
+    __slots__ = ("store", "i", "j")
+
+    def __init__(self, store, i, j):
+        self.store, self.i, self.j = store, i, j
+
+    @property
+    def friendship(self):
+        return int(self.store.friendship[self.i, self.j])
+
+    @friendship.setter
+    def friendship(self, value):
+        self.store.friendship[self.i, self.j] = value
+        self.store.touched.add(self.i * self.store.n + self.j)
+
+    @property
+    def romance(self):
+        return int(self.store.romance[self.i, self.j])
+
+    @romance.setter
+    def romance(self, value):
+        self.store.romance[self.i, self.j] = value
+        self.store.touched.add(self.i * self.store.n + self.j)
+
+    @property
+    def status(self):
+        return self.store.statuses[self.store.status[self.i, self.j]]
+
+    @status.setter
+    def status(self, value):
+        self.store.status[self.i, self.j] = self.store.status_code(value)
+        self.store.touched.add(self.i * self.store.n + self.j)
+
+class RelationshipStore:
+    """Dense n x n relationship matrices for the whole population.
+
+    Row i holds how character i sees everyone else. Characters bound to the store get
+    their `id` (row) and look relationships up through it instead of their own dicts;
+    entries about names outside the store stay in those dicts. `touched` holds the flat
+    index (i * n + j) of every cell ever written, so exporting the relationships costs
+    what the town has actually done rather than n^2.
+    """
+    def __init__(self, chars):
+        n = self.n = len(chars)
+        self.chars = list(chars)
+        self.touched = set()
+        self.ids = {c.name: i for i, c in enumerate(self.chars)}
+        self.statuses = list(STATUSES)
+        self.friendship = np.zeros((n, n), dtype=np.int32)
+        self.romance = np.zeros((n, n), dtype=np.int32)
+        self.status = np.zeros((n, n), dtype=np.uint8)
+        for i, c in enumerate(self.chars):
+            for name in [name for name in c.relationships if name in self.ids]:
+                rel = c.relationships.pop(name)
+                j = self.ids[name]
+                self.friendship[i, j], self.romance[i, j] = rel.friendship, rel.romance
+                self.status[i, j] = self.status_code(rel.status)
+                self.touched.add(i * n + j)
+            c._bind_relations(self, i)
+
+    def status_code(self, status):
+        if status not in self.statuses: self.statuses.append(status)
+        return self.statuses.index(status)
+
+    def detach(self):
+        """Copies every non-default entry back into the characters' dicts and unbinds them."""
+        from character import Relationship
+        for i, j, friendship, romance, status in self.items():
+            rel = self.chars[i].relationships[self.chars[j].name] = Relationship()
+            rel.friendship, rel.romance, rel.status = friendship, romance, status
+        for c in self.chars:
+            c._bind_relations(None, None)
+        self.chars = []
+
+    def load(self, rows, cols, friendship, romance, status, statuses):
+        """Scatters decoded save columns into the matrices: cell (rows[k], cols[k]) gets entry k.
+
+        `status` holds indices into `statuses`. Later entries for the same cell win.
+        """
+        codes = np.array([self.status_code(s) for s in statuses], dtype=np.uint8)
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        self.friendship[rows, cols] = np.asarray(friendship)
+        self.romance[rows, cols] = np.asarray(romance)
+        self.status[rows, cols] = codes[np.asarray(status, dtype=np.intp)]
+        self.touch(rows, cols)
+
+    def touch(self, rows, cols):
+        """Records bulk writes to the cells (rows[k], cols[k])."""
+        self.touched.update((rows * self.n + cols).tolist())
+
+    def view(self, i, j):
+        return RelationshipView(self, i, j)
+
+    def row(self, i):
+        """Character i's non-default relationships as plain Relationship objects keyed by name."""
+        from character import Relationship
+        rels = {}
+        for j in np.flatnonzero((self.friendship[i] != 0) | (self.romance[i] != 0) | (self.status[i] != 0)).tolist():
+            rel = rels[self.chars[j].name] = Relationship()
+            rel.friendship, rel.romance = int(self.friendship[i, j]), int(self.romance[i, j])
+            rel.status = self.statuses[self.status[i, j]]
+        return rels
+
+    def items(self):
+        """(i, j, friendship, romance, status) for every pair that is no longer strangers, row by row."""
+        captured = self.capture()
+        ii, jj, f, r, s = nonzero_cells(captured)
+        statuses = captured[4]
+        return zip(ii.tolist(), jj.tolist(), f.tolist(), r.tolist(), [statuses[k] for k in s.tolist()])
+
+    def capture(self):
+        """Copies of the touched cells and their values, to read later or on another thread."""
+        cells = np.fromiter(self.touched, np.int64, len(self.touched))
+        return (cells, self.friendship.ravel()[cells], self.romance.ravel()[cells], self.status.ravel()[cells],
+                list(self.statuses), self.n)
+
+    # --- BULK QUERIES ---
+    def top_friends(self, char, k=3):
+        """The k characters `char` likes most, best first, as (character, friendship) pairs."""
+        row = self.friendship[char.id].astype(np.int64)
+        row[char.id] = np.iinfo(np.int32).min - 1  # Never your own friend; still safe to negate
+        k = min(k, len(row) - 1)
+        if k <= 0: return []
+        best = np.argpartition(-row, k - 1)[:k]
+        best = best[np.argsort(-row[best], kind="stable")]
+        return [(self.chars[j], int(row[j])) for j in best.tolist()]
+
+    def enemies(self, char=None):
+        """(character, enemy) pairs with status Enemy, or just `char`'s enemies if given."""
+        code = self.status_code("Enemy")
+        if char is not None:
+            return [self.chars[j] for j in np.flatnonzero(self.status[char.id] == code).tolist()]
+        ii, jj = np.nonzero(self.status == code)
+        return [(self.chars[i], self.chars[j]) for i, j in zip(ii.tolist(), jj.tolist())]
@@ -0,0 +1,267 @@
+"""Versioned binary save format.
+
+Layout: an 8-byte header (magic, format version, flags) followed by a zlib-compressed
+body holding the world scalars, then one packed array per character field in
+CHAR_SCHEMA order, then the relationship table as parallel columns. Strings are
+stored as length-prefixed UTF-8 lists.
+
+Saving is split into capture(), which only copies the world's state (attribute dicts,
+position arrays, the touched relationship cells) on the main thread, and snapshot()
+plus encode(), which turn that copy into columns, pack and compress it on a worker.
+"""
+import os
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+import relations
+from character import Character, Relationship, MOVEMENT_FIELDS
+from config import RACES, MBTI_TYPES, JOBS_LIST
+
+MAGIC = b"FSIM"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+WORLD_HEADER = struct.Struct("<IdQiI")  # day, time_of_day, ticks, player index, character count
+
+TASKS = ["Idle", "Working"]
+STAT_NAMES = ["social", "intellect", "strength", "joy", "libido", "work_ethic"]
+
+# (column, array typecode, how to read it off a character's captured attributes)
+CHAR_SCHEMA = [
+    ("x", "d", lambda c: c["x"]),
+    ("y", "d", lambda c: c["y"]),
+    ("target_x", "d", lambda c: c["target_x"]),
+    ("target_y", "d", lambda c: c["target_y"]),
+    ("speed", "d", lambda c: c["speed"]),
+    ("home_x", "i", lambda c: c["home_coords"][0]),
+    ("home_y", "i", lambda c: c["home_coords"][1]),
+    ("bed_x", "i", lambda c: c["bed_coords"][0]),
+    ("bed_y", "i", lambda c: c["bed_coords"][1]),
+    ("work_x", "i", lambda c: c["work_coords"][0]),
+    ("work_y", "i", lambda c: c["work_coords"][1]),
+    ("color_r", "B", lambda c: c["color"][0]),
+    ("color_g", "B", lambda c: c["color"][1]),
+    ("color_b", "B", lambda c: c["color"][2]),
+    ("race", "B", lambda c: RACES.index(c["race"])),
+    ("mbti", "B", lambda c: MBTI_TYPES.index(c["mbti"])),
+    ("job", "B", lambda c: JOBS_LIST.index(c["job"])),
+    ("is_player", "B", lambda c: c["is_player"]),
+    ("daily_routine", "B", lambda c: c["daily_routine"]),
+    ("schedule_offset", "b", lambda c: c["schedule_offset"]),
+    ("chat_timer", "H", lambda c: max(0, c["chat_timer"])),
+    ("task", "B", lambda c: TASKS.index(c["job_state"].get("task", "Idle"))),
+    ("boat_active", "B", lambda c: bool(c["job_state"].get("boat_active"))),
+    ("field_idx", "b", lambda c: c["job_state"].get("field_idx", -1) if c["job_state"].get("path") else -1),
+    ("path_index", "H", lambda c: c["job_state"].get("path_index", 0)),
+] + [(f"stat_{s}", "B", (lambda s: lambda c: c["stats"][s])(s)) for s in STAT_NAMES]
+
+REL_SCHEMA = [("i", "I"), ("j", "I"), ("friendship", "i"), ("romance", "i"), ("status", "B")]
+
+class SaveFormatError(ValueError):
+    pass
+
+# --- CAPTURE / RESTORE ---
+def capture(world):
+    """Copies what a save needs and nothing more, so it is cheap enough for the main thread."""
+    chars = world.chars
+    states = []
+    for c in chars:
+        state = c.__dict__.copy()
+        state["job_state"] = dict(c.job_state)  # Edited every tick; stats never change after creation
+        states.append(state)
+    # Vector-bound characters keep their position in the engine's arrays, not in __dict__
+    positions = {f: getattr(world.movement, f).copy() for f in MOVEMENT_FIELDS} if world.movement is not None else None
+    store = world.relations
+    rels = store.capture() if store is not None and store.chars == chars else list(world.relationship_rows())
+    return {
+        "day": world.day, "time": world.time_of_day, "ticks": world.ticks,
+        "player_idx": chars.index(world.player_char) if world.player_char in chars else -1,
+        "states": states, "positions": positions, "rels": rels,
+    }
+
+def snapshot(captured):
+    """Turns a capture() into the plain columns encode() packs. Safe to run on a worker thread."""
+    states, positions = captured["states"], captured["positions"] or {}
+    columns = {name: positions[name].tolist() if name in positions else [get(c) for c in states]
+               for name, _, get in CHAR_SCHEMA}
+    statuses = []
+    rels = {name: [] for name, _ in REL_SCHEMA}
+    if isinstance(captured["rels"], list):
+        for i, j, friendship, romance, status in captured["rels"]:
+            if status not in statuses: statuses.append(status)
+            rels["i"].append(i); rels["j"].append(j)
+            rels["friendship"].append(friendship); rels["romance"].append(romance)
+            rels["status"].append(statuses.index(status))
+    else:
+        np = relations.np
+        ii, jj, f, r, codes = relations.nonzero_cells(captured["rels"])
+        # Number the statuses in order of first use, as the per-row path does
+        used, first = np.unique(codes, return_index=True)
+        used = used[np.argsort(first)]
+        renumber = np.zeros(len(captured["rels"][4]), dtype=np.int64)
+        renumber[used] = np.arange(len(used))
+        statuses = [captured["rels"][4][k] for k in used.tolist()]
+        rels = {"i": ii.tolist(), "j": jj.tolist(), "friendship": f.tolist(), "romance": r.tolist(),
+                "status": renumber[codes].tolist()}
+    return {
+        "day": captured["day"], "time": captured["time"], "ticks": captured["ticks"],
+        "player_idx": captured["player_idx"],
+        "names": [c["name"] for c in states],
+        "chat_texts": [c["chat_text"] or "" for c in states],
+        "columns": columns, "rels": rels, "statuses": statuses,
+    }
+
+def restore(world, snap):
+    """Rebuilds world.chars from a decoded snapshot."""
+    keys = [name for name, _, _ in CHAR_SCHEMA]
+    chars = []
+    for i, values in enumerate(zip(*(snap["columns"][key] for key in keys))):
+        col = dict(zip(keys, values))
+        name = snap["names"][i]
+        field_idx = col["field_idx"]
+        job_state = {"task": TASKS[col["task"]], "path": [], "path_index": 0, "boat_active": bool(col["boat_active"])}
+        c = Character.__new__(Character)
+        c.__setstate__({
+            "name": name, "color": (col["color_r"], col["color_g"], col["color_b"]),
+            "is_player": bool(col["is_player"]),
+            "race": RACES[col["race"]], "mbti": MBTI_TYPES[col["mbti"]], "job": JOBS_LIST[col["job"]],
+            "stats": {s: col[f"stat_{s}"] for s in STAT_NAMES}, "relationships": {},
+            "job_state": job_state, "daily_routine": col["daily_routine"], "schedule_offset": col["schedule_offset"],
+            "chat_text": snap["chat_texts"][i] or None, "chat_timer": col["chat_timer"],
+            "x": col["x"], "y": col["y"], "target_x": col["target_x"], "target_y": col["target_y"],
+            "home_coords": (col["home_x"], col["home_y"]), "bed_coords": (col["bed_x"], col["bed_y"]),
+            "work_coords": (col["work_x"], col["work_y"]), "speed": col["speed"],
+        })
+        if field_idx >= 0:
+            job_state["path"] = c._generate_farmer_path(field_idx)
+            job_state["path_index"] = col["path_index"] % len(job_state["path"])
+            job_state["field_idx"] = field_idx
+        chars.append(c)
+
+    rels, statuses = snap["rels"], snap["statuses"]
+    store = None
+    if relations.available():
+        # Straight into the matrices; like the dicts, relationships are keyed by name
+        store = relations.RelationshipStore(chars)
+        by_name = relations.np.array([store.ids[c.name] for c in chars], dtype=relations.np.int64)
+        cols = by_name[relations.np.asarray(rels["j"], dtype=relations.np.int64)]
+        store.load(rels["i"], cols, rels["friendship"], rels["romance"], rels["status"], statuses)
+    else:
+        for i, j, f, r, s in zip(rels["i"], rels["j"], rels["friendship"], rels["romance"], rels["status"]):
+            rel = Relationship()
+            rel.friendship, rel.romance, rel.status = f, r, statuses[s]
+            chars[i].relationships[chars[j].name] = rel
+
+    if world.relations is not None:
+        world.relations.detach()
+    world.relations = store
+    world.chars = chars
+    world.day, world.time_of_day, world.ticks = snap["day"], snap["time"], snap["ticks"]
+    world.player_char = chars[snap["player_idx"]] if snap["player_idx"] >= 0 else None
+
+# --- ENCODE / DECODE ---
+def pack_array(typecode, values):
+    arr = array(typecode, values)
+    if sys.byteorder == "big": arr.byteswap()
+    return arr.tobytes()
+
+def unpack_array(typecode, buf, offset, count):
+    arr = array(typecode)
+    end = offset + arr.itemsize * count
+    arr.frombytes(buf[offset:end])
+    if sys.byteorder == "big": arr.byteswap()
+    return arr, end
+
+def pack_strings(strings):
+    blobs = [s.encode("utf-8") for s in strings]
+    return pack_array("I", [len(b) for b in blobs]) + b"".join(blobs)
+
+def unpack_strings(buf, offset, count):
+    lengths, offset = unpack_array("I", buf, offset, count)
+    strings = []
+    for n in lengths:
+        strings.append(bytes(buf[offset:offset + n]).decode("utf-8"))
+        offset += n
+    return strings, offset
+
+def encode(snap, level=1):
+    n = len(snap["names"])
+    parts = [WORLD_HEADER.pack(snap["day"], snap["time"], snap["ticks"], snap["player_idx"], n),
+             pack_strings(snap["names"]), pack_strings(snap["chat_texts"])]
+    for name, typecode, _ in CHAR_SCHEMA:
+        parts.append(pack_array(typecode, snap["columns"][name]))
+    rels = snap["rels"]
+    parts.append(struct.pack("<II", len(rels["i"]), len(snap["statuses"])))
+    parts.append(pack_strings(snap["statuses"]))
+    for name, typecode in REL_SCHEMA:
+        parts.append(pack_array(typecode, rels[name]))
+    return HEADER.pack(MAGIC, VERSION, 0) + zlib.compress(b"".join(parts), level)
+
+def _decode_v1(body):
+    body = memoryview(body)
+    day, time_of_day, ticks, player_idx, n = WORLD_HEADER.unpack_from(body, 0)
+    offset = WORLD_HEADER.size
+    names, offset = unpack_strings(body, offset, n)
+    chat_texts, offset = unpack_strings(body, offset, n)
+    columns = {}
+    for name, typecode, _ in CHAR_SCHEMA:
+        columns[name], offset = unpack_array(typecode, body, offset, n)
+    n_rels, n_statuses = struct.unpack_from("<II", body, offset)
+    statuses, offset = unpack_strings(body, offset + 8, n_statuses)
+    rels = {}
+    for name, typecode in REL_SCHEMA:
+        rels[name], offset = unpack_array(typecode, body, offset, n_rels)
+    return {"day": day, "time": time_of_day, "ticks": ticks, "player_idx": player_idx,
+            "names": names, "chat_texts": chat_texts, "columns": columns, "rels": rels, "statuses": statuses}
+
+# Older format versions get a decoder here that upgrades them to the current snapshot shape
+DECODERS = {1: _decode_v1}
+
+def decode(data):
+    if len(data) < HEADER.size:
+        raise SaveFormatError("file too short")
+    magic, version, _flags = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("not a FantasySim save")
+    if version not in DECODERS:
+        raise SaveFormatError(f"unsupported save version {version}")
+    return DECODERS[version](zlib.decompress(data[HEADER.size:]))
+
+# --- FILES ---
+def write_atomic(path, data):
+    """Writes to a temp file and swaps it in, so a crash never leaves a half-written save."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def save(world, path):
+    data = encode(snapshot(capture(world)))
+    write_atomic(path, data)
+    return len(data)
+
+def load(world, path):
+    with open(path, "rb") as f:
+        restore(world, decode(f.read()))
+
+def load_legacy(world, path):
+    """Imports an old pickle save (a list of Character objects)."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    world.chars = data["chars"]
+    world.day = data["day"]
+    world.time_of_day = data["time"]
+    world.ticks = data.get("ticks", 0)
+    world.player_char = world.chars[data["player_idx"]]
+
+if __name__ == "__main__":
+    # python savefile.py savegame.pkl savegame.fsim
+    from world import World
+    if len(sys.argv) != 3:
+        sys.exit("usage: python savefile.py OLD.pkl NEW.fsim")
+    w = World()
+    load_legacy(w, sys.argv[1])
+    print(f"Converted {len(w.chars)} characters, {save(w, sys.argv[2])} bytes")
@@ -0,0 +1,262 @@
+import heapq
+import itertools
+import math
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from config import TIME_SPEED, LOD_NEAR_MARGIN, LOD_FAR_MARGIN, LOD_COARSE_EVERY
+
+CHAT_CHANCE = 0.005  # Per-tick chance that an NPC looks around for someone to talk to
+NEAR, FAR, ABSTRACT = range(3)  # Level-of-detail tiers, by distance from the camera view
+
+def _poisson(lam, rng):
+    if lam < 30:
+        limit, k, p = math.exp(-lam), 0, rng.random()
+        while p > limit:
+            k += 1
+            p *= rng.random()
+        return k
+    return max(0, int(round(rng.gauss(lam, math.sqrt(lam)))))
+
+def _partners(xs, ys, radius):
+    """For each position, the index of another one in the same radius-sized cell, or -1 if alone.
+
+    Members of a cell are paired round robin in (cell, x, y) order, so stacked or
+    neighbouring characters talk to each other as they would by any_char_near.
+    """
+    cells = np.floor(xs / radius) * 1e6 + np.floor(ys / radius)
+    order = np.lexsort((ys, xs, cells))
+    sorted_cells = cells[order]
+    first = np.r_[True, sorted_cells[1:] != sorted_cells[:-1]]
+    group_start = np.flatnonzero(first)[np.cumsum(first) - 1]
+    nxt = np.arange(1, len(order) + 1)
+    wrap = np.r_[~first[1:], False]  # False where the next sorted entry starts a new cell
+    nxt = np.where(wrap, nxt, group_start)
+    partner = np.full(len(order), -1)
+    alone = nxt == np.arange(len(order))
+    partner[order[~alone]] = order[nxt[~alone]]
+    return partner
+
+class Scheduler:
+    """Event queue for character AI.
+
+    Destinations only change at a few schedule boundaries per day, so each character
+    sits in a priority queue keyed by its next transition time and costs nothing
+    while it idles in place. Conversation attempts are drawn from the same per-tick
+    chance, but scheduled ahead as a geometric wait instead of rolled every tick.
+
+    Given the camera's view, walking and job upkeep are also tiered by distance: full
+    rate near the view, every LOD_COARSE_EVERY ticks further out, and far away
+    characters simply appear at each destination. Tiers are refreshed as the camera
+    moves, so characters are promoted before they come into sight.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.transitions = []  # heap of (world clock, seq, char)
+        self.chats = []        # heap of (world tick, seq, char)
+        self.pending = {}      # char -> seq of its live transition entry
+        self.pending_chat = {} # char -> seq of its live chat entry
+        self.active = {}       # chars needing per-tick job upkeep (farm paths, boats)
+        self.moving = {}       # chars that have not reached their target yet
+        self.speaking = {}     # chars whose chat bubble is counting down
+        self.player = None     # character steered by input, skipped by the AI
+        self.view = None       # camera rect in world space; None simulates everyone at full rate
+        self.near = {}         # chars within LOD_NEAR_MARGIN of the view
+        self.far = {}          # chars within LOD_FAR_MARGIN of the view
+        self._seq = itertools.count()
+
+    def start(self, world):
+        """Queues every character of a freshly created or loaded world."""
+        self.reset()
+        for c in world.chars:
+            self.wake(c, world)
+            self._queue_chat(c, world)
+            if c.chat_timer > 0:
+                self.speaking[c] = None
+
+    def set_view(self, world, view):
+        """Re-tiers characters around `view` = (x, y, w, h) in world space."""
+        self.view = view
+        if view is None:
+            self.near, self.far = {}, {}
+            return
+        x, y, w, h = view
+        m = LOD_NEAR_MARGIN
+        self.near = dict.fromkeys(world.grid.query_rect(x - m, y - m, w + 2 * m, h + 2 * m))
+        m = LOD_FAR_MARGIN
+        self.far = dict.fromkeys(world.grid.query_rect(x - m, y - m, w + 2 * m, h + 2 * m))
+
+    def tier(self, char):
+        if self.view is None or char is self.player or char in self.near: return NEAR
+        return FAR if char in self.far else ABSTRACT
+
+    def _coarse_skip(self, char, world):
+        # Coarse characters are staggered over the LOD_COARSE_EVERY ticks by their schedule offset
+        return (world.ticks + char.schedule_offset) % LOD_COARSE_EVERY != 0
+
+    def _teleport(self, char, world):
+        char.x, char.y = char.target_x, char.target_y
+        world.grid.move(char)
+        self.moving.pop(char, None)
+
+    def wake(self, char, world):
+        """Makes a character re-plan on the next update, dropping its queued transition."""
+        seq = next(self._seq)
+        self.pending[char] = seq
+        heapq.heappush(self.transitions, (world.clock(), seq, char))
+
+    def _queue_chat(self, char, world):
+        wait = int(math.log(1.0 - world.rng.random()) / math.log(1 - CHAT_CHANCE)) + 1
+        seq = next(self._seq)
+        self.pending_chat[char] = seq
+        heapq.heappush(self.chats, (world.ticks + wait, seq, char))
+
+    def _plan(self, char, world):
+        if char is self.player:
+            self.active.pop(char, None)
+            self.moving.pop(char, None)
+        else:
+            char.plan(world)
+            if self.tier(char) == ABSTRACT:
+                self._teleport(char, world)
+            elif world.movement is None:
+                self.moving[char] = None
+            if char.needs_job_tick():
+                self.active[char] = None
+            else:
+                self.active.pop(char, None)
+
+        seq = next(self._seq)
+        self.pending[char] = seq
+        when = world.clock() + char.time_until_next_phase(world.time_of_day)
+        heapq.heappush(self.transitions, (when, seq, char))
+
+    def update(self, world, game_mode, view=None):
+        if view is None or self.view is None or world.ticks % LOD_COARSE_EVERY == 0:
+            self.set_view(world, view)
+
+        player = world.player_char if game_mode == "NORMAL" else None
+        if player is not self.player:
+            # Mode switch or possession: whoever lost or gained input control re-plans
+            for c in (self.player, player):
+                if c is not None: self.wake(c, world)
+            self.player = player
+
+        now = world.clock()
+        while self.transitions and self.transitions[0][0] <= now:
+            _, seq, c = heapq.heappop(self.transitions)
+            if self.pending.get(c) == seq:
+                self._plan(c, world)
+
+        for c in list(self.active):
+            tier = self.tier(c)
+            if tier != NEAR and self._coarse_skip(c, world): continue
+            if not c.follow_job(world): continue
+            if tier == ABSTRACT:
+                self._teleport(c, world)
+            elif world.movement is None:
+                self.moving[c] = None
+
+        pairs = []
+        while self.chats and self.chats[0][0] <= world.ticks:
+            _, seq, c = heapq.heappop(self.chats)
+            if self.pending_chat.get(c) != seq: continue
+            if c is not self.player:
+                other = world.any_char_near(c, 40)
+                if other: pairs.append((c, other))
+            self._queue_chat(c, world)
+        for (c, _), (act, line) in zip(pairs, world.interact_many(pairs)):
+            world.speak(c, line, f"{c.name}: {line}")
+
+        for c in list(self.speaking):
+            c.chat_timer -= 1
+            if c.chat_timer <= 0:
+                del self.speaking[c]
+
+    def skip(self, world, span, game_speed, conversations=False):
+        """Jumps the world clock `span` ahead, firing every transition in between in order.
+
+        Characters teleport to each new destination. With `conversations`, each stretch
+        between events gets the number of chats its ticks at `game_speed` would have
+        produced. With numpy and a relationship store they are settled per co-located
+        pair in closed form (World.interact_repeated); otherwise they are sampled one
+        by one. Returns how many took place.
+        """
+        end = world.clock() + span
+        ticks_per_unit = 1 / (TIME_SPEED * game_speed)
+        npcs = [c for c in world.chars if c is not self.player]
+        talks = 0
+        grouped = (conversations and npcs and np is not None and world.relations is not None
+                   and world.relations.chars == world.chars)
+        if grouped:
+            chars = world.chars
+            actors = np.fromiter((c.id for c in npcs), np.intp, len(npcs))
+            xs = np.fromiter((c.x for c in chars), float, len(chars))
+            ys = np.fromiter((c.y for c in chars), float, len(chars))
+            gen = np.random.default_rng(world.rng.getrandbits(64))
+            partners = None
+        while True:
+            now = world.clock()
+            due = self.transitions[0][0] if self.transitions else end
+            midnight = world.day * 1200
+            t = min(due, midnight, end)
+
+            if grouped and t > now:
+                counts = gen.poisson(CHAT_CHANCE * (t - now) * ticks_per_unit, len(actors))
+                if partners is None:
+                    partners = _partners(xs, ys, 40)
+                    # Someone alone in their cell may still have a neighbour just across its edge
+                    for i in np.flatnonzero(partners < 0).tolist():
+                        other = world.any_char_near(chars[i], 40)
+                        if other: partners[i] = other.id
+                ti = partners[actors]
+                met = (counts > 0) & (ti >= 0)
+                if met.any():
+                    talks += world.interact_repeated(actors[met], ti[met], counts[met], gen)
+            elif conversations and npcs and t > now:
+                lam = len(npcs) * CHAT_CHANCE * (t - now) * ticks_per_unit
+                pairs = []
+                for _ in range(_poisson(lam, world.rng)):
+                    actor = world.rng.choice(npcs)
+                    other = world.any_char_near(actor, 40)
+                    if other: pairs.append((actor, other))
+                world.interact_many(pairs)
+                talks += len(pairs)
+
+            if t == midnight:
+                world.time_of_day = 0
+                world.start_new_day()
+            else:
+                world.time_of_day = t - (world.day - 1) * 1200
+            if t == end and due > end:
+                return talks
+
+            while self.transitions and self.transitions[0][0] <= t:
+                _, seq, c = heapq.heappop(self.transitions)
+                if self.pending.get(c) != seq: continue
+                self._plan(c, world)
+                if c is not self.player:
+                    self._teleport(c, world)
+                    if grouped:
+                        xs[c.id], ys[c.id] = c.x, c.y
+                        partners = None
+
+    def move(self, world, scale=1, lod=True):
+        """Steps every character still walking to its target; arrivals leave the set."""
+        for c in list(self.moving):
+            if c is not self.player:
+                tier = self.tier(c) if lod else NEAR
+                if tier == ABSTRACT:
+                    self._teleport(c, world)
+                    continue
+                if tier == FAR:
+                    if self._coarse_skip(c, world): continue
+                    arrived = c.move(scale * LOD_COARSE_EVERY)
+                else:
+                    arrived = c.move(scale)
+                world.grid.move(c)
+                if not arrived: continue
+            del self.moving[c]
@@ -1,4 +1,8 @@
 import random
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 DIALOGUE_DB = {
     "greet_friendly": ["Hail, friend!", "Good to see you.", "Hello there!", "Well met!", "Hi!"],
@@ -9,12 +13,15 @@ DIALOGUE_DB = {
     "job_farmer": ["Harvest will be good.", "Rain's coming.", "Hard work, honest life."]
 }
 
-def get_dialogue(key):
-    return random.choice(DIALOGUE_DB.get(key, ["..."]))
+def get_dialogue(key, rng=random):
+    return rng.choice(DIALOGUE_DB.get(key, ["..."]))
 
-def process_interaction(actor, target, manual_choice=None):
-    rel = actor.get_relationship(target.name)
-    target_rel = target.get_relationship(actor.name)
+ACTS = ("Chat", "Flirt", "Insult")
+CHAT, FLIRT, INSULT = range(3)
+
+def process_interaction(actor, target, manual_choice=None, rng=random):
+    rel = actor.relationship_with(target)
+    target_rel = target.relationship_with(actor)
     
     act_type = "Chat"
     line = "..."
@@ -26,20 +33,20 @@ def process_interaction(actor, target, manual_choice=None):
         elif manual_choice == 3: act_type = "Insult"
     else:
         # AI Decision
-        if rel.romance > 15: act_type = "Flirt" if random.random() < 0.4 else "Chat"
+        if rel.romance > 15: act_type = "Flirt" if rng.random() < 0.4 else "Chat"
         elif rel.friendship < -15: act_type = "Insult"
         else: act_type = "Chat"
 
     # 2. Outcome Logic
     if act_type == "Chat":
         if rel.friendship >= 0:
-            line = get_dialogue("greet_friendly")
+            line = get_dialogue("greet_friendly", rng)
             rel.friendship += 1; target_rel.friendship += 1
         else:
-            line = get_dialogue("greet_hostile")
+            line = get_dialogue("greet_hostile", rng)
             
     elif act_type == "Flirt":
-        line = get_dialogue("flirt")
+        line = get_dialogue("flirt", rng)
         attract = (actor.stats['social'] + actor.stats['libido']) 
         standards = target.stats['intellect']
         if attract >= standards or rel.romance > 5:
@@ -49,7 +56,7 @@ def process_interaction(actor, target, manual_choice=None):
             rel.friendship -= 2
             
     elif act_type == "Insult":
-        line = get_dialogue("insult")
+        line = get_dialogue("insult", rng)
         rel.friendship -= 5; target_rel.friendship -= 8
         target_rel.status = "Enemy"
 
@@ -61,4 +68,93 @@ def process_interaction(actor, target, manual_choice=None):
             elif r.friendship > 40: r.status = "Bestie"
             elif r.friendship < -20: r.status = "Enemy"
 
-    return act_type, line
\ No newline at end of file
+    return act_type, line
+
+def process_interactions(pairs, store=None, rng=random):
+    """Runs process_interaction for every (actor, target) pair met in one tick. Returns [(act, line)].
+
+    With a RelationshipStore the decisions, deltas and status labels are computed for
+    all pairs at once; every pair decides from the relationships as they stood at the
+    start of the batch, then dialogue lines are picked afterwards.
+    """
+    if not pairs: return []
+    if store is None or np is None or any(a._relations is not store or t._relations is not store for a, t in pairs):
+        return [process_interaction(a, t, rng=rng) for a, t in pairs]
+
+    ai = np.fromiter((a.id for a, _ in pairs), np.intp, len(pairs))
+    ti = np.fromiter((t.id for _, t in pairs), np.intp, len(pairs))
+    friendship, romance, status = store.friendship, store.romance, store.status
+    fr, ro = friendship[ai, ti], romance[ai, ti]
+
+    # 1. Decision Logic
+    flirty = ro > 15
+    rolls = np.fromiter((rng.random() for _ in range(int(flirty.sum()))), float)
+    act = np.full(len(pairs), CHAT)
+    act[flirty] = np.where(rolls < 0.4, FLIRT, CHAT)
+    act[~flirty & (fr < -15)] = INSULT
+
+    # 2. Outcome Logic
+    chat, flirt, insult = act == CHAT, act == FLIRT, act == INSULT
+    friendly = chat & (fr >= 0)
+    attract = np.fromiter((a.stats["social"] + a.stats["libido"] for a, _ in pairs), np.int64, len(pairs))
+    standards = np.fromiter((t.stats["intellect"] for _, t in pairs), np.int64, len(pairs))
+    accepted = flirt & ((attract >= standards) | (ro > 5))
+    rejected = flirt & ~accepted
+
+    np.add.at(friendship, (ai, ti), friendly * 1 - rejected * 2 - insult * 5)
+    np.add.at(friendship, (ti, ai), friendly * 1 - insult * 8)
+    np.add.at(romance, (ai, ti), accepted * 4)
+    np.add.at(romance, (ti, ai), accepted * 3)
+    status[ti[insult], ai[insult]] = store.status_code("Enemy")
+
+    _relabel(store, ai, ti)
+
+    results = []
+    for k in range(len(pairs)):
+        if friendly[k]: line = get_dialogue("greet_friendly", rng)
+        elif chat[k]: line = get_dialogue("greet_hostile", rng)
+        elif accepted[k]: line = get_dialogue("flirt", rng)
+        elif rejected[k]: line = "...I don't think so."
+        else: line = get_dialogue("insult", rng)
+        results.append((ACTS[act[k]], line))
+    return results
+
+def process_repeated(ai, ti, counts, store, gen):
+    """Outcome of counts[k] conversations that character ai[k] starts with ti[k], in closed form.
+
+    Used when skipping time: between schedule events nobody moves, so the same pairs meet
+    over and over. As in process_interactions every pair decides from the relationships
+    at the start. A romance above 15 makes each meeting a flirt with chance 0.4, always
+    accepted by then; otherwise friendship below -15 makes every meeting an insult; the
+    remaining meetings are chats, worth one friendship each way if friendly. `gen` is a
+    numpy Generator. Returns {act: count}.
+    """
+    friendship, romance, status = store.friendship, store.romance, store.status
+    fr, ro = friendship[ai, ti], romance[ai, ti]
+    flirty = ro > 15
+    flirts = np.where(flirty, gen.binomial(counts, 0.4), 0)
+    insults = np.where(~flirty & (fr < -15), counts, 0)
+    chats = counts - flirts - insults
+    friendly = np.where(fr >= 0, chats, 0)
+
+    np.add.at(friendship, (ai, ti), friendly - insults * 5)
+    np.add.at(friendship, (ti, ai), friendly - insults * 8)
+    np.add.at(romance, (ai, ti), flirts * 4)
+    np.add.at(romance, (ti, ai), flirts * 3)
+    insulted = insults > 0
+    status[ti[insulted], ai[insulted]] = store.status_code("Enemy")
+    _relabel(store, ai, ti)
+    return {"Chat": int(chats.sum()), "Flirt": int(flirts.sum()), "Insult": int(insults.sum())}
+
+def _relabel(store, ai, ti):
+    """Updates the status labels of both directions of every pair after a batch."""
+    friendship, romance, status = store.friendship, store.romance, store.status
+    exes = store.status_code("Exes")
+    rows, cols = np.concatenate([ai, ti]), np.concatenate([ti, ai])
+    store.touch(rows, cols)  # Every cell a batch writes is (a, t) or (t, a)
+    f, r = friendship[rows, cols], romance[rows, cols]
+    labels = status[rows, cols]
+    codes = np.array([store.status_code(s) for s in ("Lover", "Crush", "Bestie", "Enemy")], status.dtype)
+    labels = np.select([r > 40, r > 20, f > 40, f < -20], list(codes), labels)
+    keep = status[rows, cols] == exes
+    status[rows[~keep], cols[~keep]] = labels[~keep]
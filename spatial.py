@@ -0,0 +1,140 @@
+class SpatialGrid:
+    """Uniform grid that buckets characters by position for fast proximity queries.
+
+    Each bucket stores the position a character was filed at, so queries never go
+    back to the characters' own (possibly array-backed) coordinates.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}       # (col, row) -> {char: (x, y)}, a dict keeps insertion order stable
+        self.char_cells = {}  # char -> (col, row)
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def clear(self):
+        self.cells = {}
+        self.char_cells = {}
+
+    def rebuild(self, chars):
+        self.clear()
+        for c in chars:
+            self.insert(c)
+
+    def insert(self, char):
+        cell = self._cell(char.x, char.y)
+        self.cells.setdefault(cell, {})[char] = (char.x, char.y)
+        self.char_cells[char] = cell
+
+    def remove(self, char):
+        cell = self.char_cells.pop(char, None)
+        if cell is None: return
+        bucket = self.cells[cell]
+        del bucket[char]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, char):
+        """Re-files a character after its position changed."""
+        self.place(char, char.x, char.y)
+
+    def place(self, char, x, y):
+        """move() for a caller that already has the new position at hand."""
+        cell = self._cell(x, y)
+        old = self.char_cells.get(char)
+        if old == cell:
+            self.cells[cell][char] = (x, y)
+            return
+        if old is not None:
+            bucket = self.cells[old]
+            del bucket[char]
+            if not bucket:
+                del self.cells[old]
+        self.cells.setdefault(cell, {})[char] = (x, y)
+        self.char_cells[char] = cell
+
+    def position(self, char):
+        """Where `char` was last filed."""
+        return self._bucket(self.char_cells[char])[char]
+
+    def _bucket(self, cell):
+        """The {char: (x, y)} bucket of `cell`, or None. Every query reads buckets through here."""
+        return self.cells.get(cell)
+
+    def query_radius(self, x, y, radius, exclude=None):
+        """Returns all characters strictly closer than `radius` to (x, y)."""
+        col0, row0 = self._cell(x - radius, y - radius)
+        col1, row1 = self._cell(x + radius, y + radius)
+        r2 = radius * radius
+        found = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = self._bucket((col, row))
+                if not bucket: continue
+                for c, (cx, cy) in bucket.items():
+                    if c is not exclude and (cx - x)**2 + (cy - y)**2 < r2:
+                        found.append(c)
+        return found
+
+    def _home_first(self, x, y, radius):
+        """The cells within `radius` of (x, y), starting with the one (x, y) is in."""
+        home = self._cell(x, y)
+        col0, row0 = self._cell(x - radius, y - radius)
+        col1, row1 = self._cell(x + radius, y + radius)
+        return [home] + [(col, row) for row in range(row0, row1 + 1) for col in range(col0, col1 + 1)
+                         if (col, row) != home]
+
+    def any_within(self, x, y, radius, exclude=None):
+        """Some character strictly closer than `radius` to (x, y), or None. Stops at the first hit.
+
+        The home cell is searched first, so in a crowd this costs one or two checks.
+        """
+        r2 = radius * radius
+        for cell in self._home_first(x, y, radius):
+            bucket = self._bucket(cell)
+            if not bucket: continue
+            for c, (cx, cy) in bucket.items():
+                if c is not exclude and (cx - x)**2 + (cy - y)**2 < r2:
+                    return c
+        return None
+
+    def query_rect(self, left, top, width, height):
+        """Returns all characters inside the given world-space rectangle."""
+        col0, row0 = self._cell(left, top)
+        col1, row1 = self._cell(left + width, top + height)
+        right, bottom = left + width, top + height
+        found = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = self._bucket((col, row))
+                if not bucket: continue
+                if col0 < col < col1 and row0 < row < row1:
+                    found.extend(bucket)  # Interior cells lie wholly inside the rectangle
+                    continue
+                for c, (cx, cy) in bucket.items():
+                    if left <= cx < right and top <= cy < bottom:
+                        found.append(c)
+        return found
+
+    def nearest(self, x, y, max_dist, exclude=None):
+        """Closest character strictly within `max_dist` of (x, y), searching outward ring by ring."""
+        cs = self.cell_size
+        ccol, crow = self._cell(x, y)
+        best, best_d2 = None, max_dist * max_dist
+        ring = 0
+        while True:
+            for row in range(crow - ring, crow + ring + 1):
+                edge = row == crow - ring or row == crow + ring
+                cols = range(ccol - ring, ccol + ring + 1) if edge else (ccol - ring, ccol + ring)
+                for col in cols:
+                    bucket = self._bucket((col, row))
+                    if not bucket: continue
+                    for c, (cx, cy) in bucket.items():
+                        if c is exclude: continue
+                        d2 = (cx - x)**2 + (cy - y)**2
+                        if d2 < best_d2:
+                            best, best_d2 = c, d2
+            # Anything in the next ring is at least ring * cell_size away
+            if (ring * cs)**2 >= best_d2:
+                return best
+            ring += 1
@@ -0,0 +1,25 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import movement
+from world import World
+from headless import DEFAULT_PLAYER, run
+
+ENGINES = [False, True] if movement.available() else [False]
+
+def _digest(seed, vectorized=False):
+    world = World(seed=seed, vectorized=vectorized)
+    world.create_new(DEFAULT_PLAYER, population=40)
+    run(world, ticks=300)
+    world.skip(400, log=False)  # Through the analytic fast-forward as well
+    run(world, ticks=200)
+    return world.digest()
+
+@pytest.mark.parametrize("vectorized", ENGINES)
+def test_same_seed_same_digest(vectorized):
+    assert _digest(7, vectorized) == _digest(7, vectorized)
+
+def test_different_seed_different_digest():
+    assert _digest(7) != _digest(8)
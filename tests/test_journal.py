@@ -0,0 +1,72 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from world import World
+from headless import DEFAULT_PLAYER
+
+def _world():
+    world = World(seed=3)
+    world.create_new(DEFAULT_PLAYER)
+    return world
+
+def _state(world):
+    """What a journaled save promises to restore."""
+    return (world.day, world.time_of_day, world.ticks, sorted(world.relationship_rows()),
+            [(c.name, c.job, round(c.x, 6), round(c.y, 6), c.daily_routine, c.is_player) for c in world.chars])
+
+def _loaded(path):
+    world = World(seed=3)
+    assert world.load(path)
+    return world
+
+def test_delta_round_trip_on_two_paths(tmp_path):
+    a, b = str(tmp_path / "a.fsim"), str(tmp_path / "b.fsim")
+    world = _world()
+    world.save(a)
+    world.save(b)
+
+    actor, target = world.chars[1], world.chars[2]
+    for _ in range(10):
+        world.interact(actor, target, 1)
+    world.set_job(world.chars[3], "Scholar")
+    world.step(50)
+    world.save(a)
+    world.save(b)  # Must still carry the changes a's delta already wrote
+
+    assert list(world.relationship_rows())
+    for path in (a, b):
+        loaded = _loaded(path)
+        assert loaded.chars[3].job == "Scholar"
+        assert _state(loaded) == _state(world)
+
+def test_changes_after_a_delta_reach_the_next_delta(tmp_path):
+    a, b = str(tmp_path / "a.fsim"), str(tmp_path / "b.fsim")
+    world = _world()
+    world.save(a)
+    world.save(b)
+    world.interact(world.chars[1], world.chars[2], 1)
+    world.save(a)
+    world.interact(world.chars[2], world.chars[4], 3)
+    world.save(b)
+    world.save(a)
+
+    for path in (a, b):
+        assert _state(_loaded(path)) == _state(world)
+
+def test_latest_path_counts_delta_saves(tmp_path, monkeypatch):
+    import time
+    import autosave
+    monkeypatch.chdir(tmp_path)
+    saver = autosave.Autosaver(interval=0)
+    world = _world()
+    world.save(autosave.SAVE_PATH)
+    time.sleep(0.02)
+    world.save(saver.slot_path(0))
+    time.sleep(0.02)
+    world.step(100)
+    world.save(autosave.SAVE_PATH)  # A delta: only the journal changes
+    try:
+        assert saver.latest_path() == autosave.SAVE_PATH
+    finally:
+        saver.close()
@@ -0,0 +1,48 @@
+import os
+import pickle
+import subprocess
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import savefile
+from world import World
+from headless import DEFAULT_PLAYER
+
+def _world():
+    world = World(seed=11)
+    world.create_new(DEFAULT_PLAYER, population=24)
+    world.step(400)
+    assert list(world.relationship_rows())
+    return world
+
+def _restored(data):
+    world = World(seed=12)
+    savefile.restore(world, savefile.decode(data))
+    world._reindex()
+    return world
+
+def test_round_trip_keeps_the_digest():
+    world = _world()
+    data = savefile.encode(savefile.snapshot(savefile.capture(world)))
+    assert _restored(data).digest() == world.digest()
+
+def test_rejects_other_files():
+    for data in (b"", b"PK\x03\x04" + bytes(8), savefile.HEADER.pack(savefile.MAGIC, 99, 0)):
+        try:
+            savefile.decode(data)
+        except savefile.SaveFormatError:
+            continue
+        raise AssertionError(f"decoded {data!r}")
+
+def test_converts_a_legacy_pickle(tmp_path):
+    world = _world()
+    old, new = tmp_path / "old.pkl", tmp_path / "new.fsim"
+    with open(old, "wb") as f:
+        pickle.dump({"chars": world.chars, "day": world.day, "time": world.time_of_day, "ticks": world.ticks,
+                     "player_idx": world.chars.index(world.player_char)}, f)
+
+    subprocess.run([sys.executable, os.path.join(ROOT, "savefile.py"), str(old), str(new)],
+                   cwd=tmp_path, check=True, capture_output=True)
+    with open(new, "rb") as f:
+        assert _restored(f.read()).digest() == world.digest()
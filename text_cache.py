@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from config import FONTS
+
+class TextCache:
+    """Bounded LRU of rendered text surfaces, keyed by (font name, text, color).
+
+    Font rasterisation is one of the most expensive calls per frame, while chat bubbles,
+    labels and HUD lines repeat the same few strings over and over.
+    """
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font_name, text, color):
+        key = (font_name, text, color)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = FONTS[font_name].render(text, True, color)
+        self.entries[key] = surf
+        self.size_bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        while len(self.entries) > self.max_entries or (self.size_bytes > self.max_bytes and len(self.entries) > 1):
+            _, old = self.entries.popitem(last=False)
+            self.size_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self.entries), "bytes": self.size_bytes, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+TEXT_CACHE = TextCache()
+
+def render_text(font_name, text, color):
+    return TEXT_CACHE.render(font_name, text, color)
@@ -0,0 +1,83 @@
+import math
+from config import MAP_W, MAP_H, TILE_SIZE, LOCATIONS, LAKE_COL_START, LAKE_COL_END
+
+GRASS, SEA, FRESH, DIRT = 0, 1, 2, 3
+# Map files are plain text, one character per tile and one line per row
+TILE_CHARS = {".": GRASS, "~": SEA, "o": FRESH, "#": DIRT}
+
+class TileMap:
+    """Terrain type of every tile, precomputed once so renderer, sounds and AI look it up in O(1)."""
+    def __init__(self, tiles):
+        self.tiles = tiles  # list of bytearray rows
+        self.rows, self.cols = len(tiles), len(tiles[0])
+        self.width, self.height = self.cols * TILE_SIZE, self.rows * TILE_SIZE
+        self._sea_distance = None
+
+    @classmethod
+    def from_config(cls, map_w=MAP_W, map_h=MAP_H):
+        cols, rows = math.ceil(map_w / TILE_SIZE), math.ceil(map_h / TILE_SIZE)
+        farm = LOCATIONS.get("FARM")
+        tiles = []
+        for row in range(rows):
+            line = bytearray(cols)
+            tile_y = row * TILE_SIZE
+            for col in range(cols):
+                tile_x = col * TILE_SIZE
+                if tile_y > 1200:
+                    line[col] = SEA
+                elif LAKE_COL_START <= col < LAKE_COL_END and 550 < tile_y < 1100:
+                    line[col] = FRESH
+                elif farm and farm.collidepoint(tile_x, tile_y):
+                    line[col] = DIRT
+            tiles.append(line)
+        return cls(tiles)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            lines = [line.rstrip("\n") for line in f if line.strip()]
+        width = max(len(line) for line in lines)
+        return cls([bytearray(TILE_CHARS.get(ch, GRASS) for ch in line.ljust(width, ".")) for line in lines])
+
+    def save(self, path):
+        symbols = {code: ch for ch, code in TILE_CHARS.items()}
+        with open(path, "w") as f:
+            for line in self.tiles:
+                f.write("".join(symbols[t] for t in line) + "\n")
+
+    def kind(self, col, row):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.tiles[row][col]
+        return GRASS
+
+    def tile_at(self, x, y):
+        return self.kind(int(x // TILE_SIZE), int(y // TILE_SIZE))
+
+    def sea_distance(self, x, y):
+        """Distance in tiles from (x, y) to the nearest sea tile, capped at 255."""
+        if self._sea_distance is None:
+            self._sea_distance = self._distance_field(SEA)
+        col = min(max(int(x // TILE_SIZE), 0), self.cols - 1)
+        row = min(max(int(y // TILE_SIZE), 0), self.rows - 1)
+        return self._sea_distance[row][col]
+
+    def _distance_field(self, kind):
+        # Multi-source BFS over 8-neighbours, so the distance is in whole tiles
+        dist = [bytearray(b"\xff" * self.cols) for _ in range(self.rows)]
+        frontier = [(c, r) for r in range(self.rows) for c in range(self.cols) if self.tiles[r][c] == kind]
+        for c, r in frontier:
+            dist[r][c] = 0
+        d = 0
+        while frontier and d < 254:
+            d += 1
+            nxt = []
+            for c, r in frontier:
+                for nr in (r - 1, r, r + 1):
+                    if not 0 <= nr < self.rows: continue
+                    row = dist[nr]
+                    for nc in (c - 1, c, c + 1):
+                        if 0 <= nc < self.cols and row[nc] == 255:
+                            row[nc] = d
+                            nxt.append((nc, nr))
+            frontier = nxt
+        return dist
@@ -1,25 +1,58 @@
 import pygame
-from config import COLORS, FONTS
+from config import COLORS
+from text_cache import render_text
+
+class CachedLayer:
+    """A UI surface that is only redrawn when the key describing its contents changes."""
+    def __init__(self, size, flags=0):
+        self.size = size
+        self.flags = flags
+        self.surface = None
+        self.key = None
+
+    def get(self, key, draw):
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size, self.flags)
+            if pygame.display.get_surface():
+                self.surface = self.surface.convert_alpha() if self.flags & pygame.SRCALPHA else self.surface.convert()
+        if key != self.key:
+            draw(self.surface)
+            self.key = key
+        return self.surface
 
 class UIManager:
     def __init__(self, screen_dims):
         self.screen_w, self.screen_h = screen_dims
+        self.log_layer = CachedLayer((self.screen_w, 100))
+        self.char_layer = CachedLayer((280, 300))
+        self.menu_layer = CachedLayer((200, 150))
+        self.pause_layer = CachedLayer((self.screen_w, self.screen_h), pygame.SRCALPHA)
+        self.header = None
+        self.header_key = None
     
-    def draw_main_menu(self, surface, selection_idx):
+    def draw_main_menu(self, surface, selection_idx, loading=None):
         surface.fill(COLORS["ui_bg"])
-        title = FONTS["header"].render("FANTASY LIFE SIM", True, COLORS["text_highlight"])
+        title = render_text("header", "FANTASY LIFE SIM", COLORS["text_highlight"])
         surface.blit(title, (self.screen_w // 2 - title.get_width() // 2, 200))
         
         opts = ["NEW GAME", "LOAD GAME", "QUIT"]
         for i, txt in enumerate(opts):
             col = COLORS["selection"] if i == selection_idx else COLORS["text"]
-            t = FONTS["menu"].render(txt, True, col)
+            t = render_text("menu", txt, col)
             surface.blit(t, (self.screen_w // 2 - t.get_width() // 2, 400 + i * 60))
 
+        # Assets still streaming in the background: fraction done, 0..1
+        if loading is not None:
+            bar = pygame.Rect(self.screen_w // 2 - 150, self.screen_h - 80, 300, 8)
+            pygame.draw.rect(surface, COLORS["text_dark"], bar, 1)
+            pygame.draw.rect(surface, COLORS["text_highlight"], (bar.x, bar.y, int(bar.w * loading), bar.h))
+            t = render_text("default", f"Loading assets {int(loading * 100)}%", COLORS["text_dark"])
+            surface.blit(t, (self.screen_w // 2 - t.get_width() // 2, bar.y - 22))
+
     def draw_creation_menu(self, surface, creation_data, selection_idx):
         from config import RACES, JOBS_LIST, MBTI_TYPES
         surface.fill((10, 10, 15))
-        title = FONTS["header"].render("CREATE CHARACTER", True, COLORS["text_highlight"])
+        title = render_text("header", "CREATE CHARACTER", COLORS["text_highlight"])
         surface.blit(title, (self.screen_w // 2 - title.get_width() // 2, 100))
 
         labels = [
@@ -30,22 +63,50 @@ class UIManager:
         ]
         for i, txt in enumerate(labels):
             col = COLORS["selection"] if i == selection_idx else COLORS["text"]
-            t = FONTS["menu"].render(txt, True, col)
+            t = render_text("menu", txt, col)
             surface.blit(t, (self.screen_w // 2 - t.get_width() // 2, 300 + i * 80))
 
-        hint = FONTS["default"].render("[ARROWS] Select/Change | [ENTER] Confirm | [ESC] Back", True, COLORS["text_dark"])
+        hint = render_text("default", "[ARROWS] Select/Change | [ENTER] Confirm | [ESC] Back", COLORS["text_dark"])
         surface.blit(hint, (self.screen_w // 2 - hint.get_width() // 2, self.screen_h - 100))
 
     def draw_game_ui(self, surface, game_world, game_state, selected_char, player_target):
         # Bottom Log
-        pygame.draw.rect(surface, COLORS["black"], (0, self.screen_h - 100, self.screen_w, 100))
-        pygame.draw.line(surface, COLORS["text_highlight"], (0, self.screen_h - 100), (self.screen_w, self.screen_h - 100), 2)
-        for i, line in enumerate(reversed(game_world.interaction_log[-3:])):
-            surface.blit(FONTS["default"].render(line, True, COLORS["text"]), (30, self.screen_h - 35 - i * 25))
+        lines = tuple(game_world.interaction_log.tail(3))
+        panel = self.log_layer.get(lines, lambda layer: self._draw_log(layer, lines))
+        surface.blit(panel, (0, self.screen_h - 100))
+
+        # Clock header, re-rendered once per game minute
+        total_minutes = int((game_world.time_of_day / 1200) * 1440)
+        key = (total_minutes, game_world.day, game_state.speed, f"{game_state.zoom:.1f}")
+        if key != self.header_key:
+            self.header_key = key
+            self.header = render_text("header", self._info_line(total_minutes, game_world.day, game_state), COLORS["white"])
+        surface.blit(self.header, (20, 20))
+
+        if selected_char:
+            if game_state.mode in ["GOD", "EDITOR"]:
+                data = selected_char.get_full_info()
+                info = (f"{data['name']} ({data['job']})", f"{data['race']} {data['mbti']}", "--- GOD TOOLS ---", "[E] Edit  [C] Reroll  [P] Possess")
+            else:
+                data = selected_char.get_known_info(game_world.player_char)
+                info = (f"{data['name']}", f"Job: {data['job']}", f"Type: {data['mbti']}", f"Status: {data['status']}")
+            surface.blit(self.char_layer.get(info, lambda layer: self._draw_char_panel(layer, info)),
+                         (self.screen_w - 300, 60))
+        
+        if player_target:
+            sel = game_state.interaction_selection
+            menu = self.menu_layer.get((player_target.name, sel),
+                                       lambda layer: self._draw_interaction_menu(layer, player_target, sel))
+            surface.blit(menu, (self.screen_w // 2 - 100, self.screen_h // 2 - 100))
+
+        if game_state.current == "PAUSE":
+            surface.blit(self.pause_layer.get("PAUSED", lambda layer: layer.fill((0, 0, 0, 150))), (0, 0))
+            t = render_text("header", "PAUSED", COLORS["white"])
+            surface.blit(t, (self.screen_w // 2 - t.get_width() // 2, self.screen_h // 2))
 
+    def _info_line(self, total_minutes, day, game_state):
         # --- NEW DATE/TIME LOGIC ---
         # 1. Calculate Time (0-1200 scale -> 24h clock)
-        total_minutes = int((game_world.time_of_day / 1200) * 1440)
         hour_24 = total_minutes // 60
         minute = total_minutes % 60
         period = "am" if hour_24 < 12 else "pm"
@@ -59,7 +120,7 @@ class UIManager:
             ("September", 30), ("October", 31), ("November", 30), ("December", 31)
         ]
         
-        days_total = game_world.day - 1
+        days_total = day - 1
         year = 1 + (days_total // 365)
         day_of_year = days_total % 365
         
@@ -75,50 +136,30 @@ class UIManager:
         date_str = f"{month_name} {day_num} Year {year}"
         
         # 3. Compile Info String
-        info = f"{time_str} {date_str} | Speed x{game_state.speed} | Zoom {game_state.zoom:.1f}x"
-        # ---------------------------
-
-        surface.blit(FONTS["header"].render(info, True, COLORS["white"]), (20, 20))
+        return f"{time_str} {date_str} | Speed x{game_state.speed} | Zoom {game_state.zoom:.1f}x"
 
-        if selected_char:
-            self._draw_char_panel(surface, selected_char, game_state.mode, game_world.player_char)
-        
-        if player_target:
-            self._draw_interaction_menu(surface, player_target, game_state.interaction_selection)
+    # --- CACHED LAYERS ---
+    def _draw_log(self, layer, lines):
+        layer.fill(COLORS["black"])
+        pygame.draw.line(layer, COLORS["text_highlight"], (0, 0), (self.screen_w, 0), 2)
+        for i, line in enumerate(reversed(lines)):
+            layer.blit(render_text("default", line, COLORS["text"]), (30, 65 - i * 25))
 
-        if game_state.current == "PAUSE":
-            overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            surface.blit(overlay, (0, 0))
-            t = FONTS["header"].render("PAUSED", True, COLORS["white"])
-            surface.blit(t, (self.screen_w // 2 - t.get_width() // 2, self.screen_h // 2))
-
-
-    def _draw_char_panel(self, surface, char, game_mode, player_char):
-        panel = pygame.Rect(self.screen_w - 300, 60, 280, 300)
-        pygame.draw.rect(surface, COLORS["ui_bg"], panel)
-        pygame.draw.rect(surface, COLORS["white"], panel, 2)
-        
-        if game_mode in ["GOD", "EDITOR"]:
-            data = char.get_full_info()
-            lines = [f"{data['name']} ({data['job']})", f"{data['race']} {data['mbti']}", "--- GOD TOOLS ---", "[E] Edit  [C] Reroll  [P] Possess"]
-        else:
-            data = char.get_known_info(player_char)
-            lines = [f"{data['name']}", f"Job: {data['job']}", f"Type: {data['mbti']}", f"Status: {data['status']}"]
-            
+    def _draw_char_panel(self, layer, lines):
+        layer.fill(COLORS["ui_bg"])
+        pygame.draw.rect(layer, COLORS["white"], layer.get_rect(), 2)
         for i, txt in enumerate(lines):
-            surface.blit(FONTS["default"].render(txt, True, COLORS["text"]), (panel.x + 10, panel.y + 10 + i * 25))
+            layer.blit(render_text("default", txt, COLORS["text"]), (10, 10 + i * 25))
 
-    def _draw_interaction_menu(self, surface, target, selection_idx):
-        menu_rect = pygame.Rect(self.screen_w // 2 - 100, self.screen_h // 2 - 100, 200, 150)
-        pygame.draw.rect(surface, COLORS["ui_bg"], menu_rect)
-        pygame.draw.rect(surface, COLORS["white"], menu_rect, 2)
+    def _draw_interaction_menu(self, layer, target, selection_idx):
+        layer.fill(COLORS["ui_bg"])
+        pygame.draw.rect(layer, COLORS["white"], layer.get_rect(), 2)
         
-        title = FONTS["header"].render(target.name, True, COLORS["text_highlight"])
-        surface.blit(title, (menu_rect.x + 20, menu_rect.y + 10))
+        title = render_text("header", target.name, COLORS["text_highlight"])
+        layer.blit(title, (20, 10))
         
         opts = ["Chat", "Flirt", "Insult", "Cancel"]
         for i, o in enumerate(opts):
             col = COLORS["selection"] if i == selection_idx else COLORS["text"]
-            text = FONTS["default"].render(o, True, col)
-            surface.blit(text, (menu_rect.x + 20, menu_rect.y + 50 + i * 25))
+            text = render_text("default", o, col)
+            layer.blit(text, (20, 50 + i * 25))
@@ -1,18 +1,32 @@
 import random
 import math
+import collections
+import hashlib
 import pickle
 import os
+import struct
+import zlib
+import savefile
 from character import Character, RACES, MBTI_TYPES
-from config import MAP_W, MAP_H, LOCATIONS, BEDS, HOUSES, JOBS_LIST, PATROL_POINTS, INN_BAR_AREA, RANCH, FIELDS, TIME_SPEED
+from spatial import SpatialGrid
+from schedule import Scheduler
+from social import process_interaction, process_interactions, process_repeated
+import journal
+from tilemap import TileMap
+import movement
+import relations
+from interaction_log import InteractionLog, LogSink
+from config import MAP_W, MAP_H, LOCATIONS, BEDS, HOUSES, JOBS_LIST, PATROL_POINTS, INN_BAR_AREA, RANCH, FIELDS, TIME_SPEED, VECTOR_MOVEMENT, MAP_FILE, SAVE_PATH, LEGACY_SAVE_PATH, LOG_FILE, JOB_OPENINGS
 
 class Environment:
-    def __init__(self):
+    def __init__(self, rng=random):
+        self.rng = rng
         self.particles = []
 
     def update(self, time_of_day):
         is_night = time_of_day > 850 or time_of_day < 350
         if is_night and len(self.particles) < 60:
-            self.particles.append([random.randint(0, MAP_W), random.randint(0, MAP_H), random.randint(0, 100)])
+            self.particles.append([self.rng.randint(0, MAP_W), self.rng.randint(0, MAP_H), self.rng.randint(0, 100)])
         elif not is_night:
             self.particles = []
 
@@ -22,23 +36,56 @@ class Environment:
             p[2] += 1
 
 class World:
-    def __init__(self):
+    def __init__(self, vectorized=VECTOR_MOVEMENT, seed=None):
+        if vectorized and not movement.available():
+            print("NumPy not installed, falling back to per-character movement.")
+        self.vectorized = vectorized and movement.available()
+        self.movement = None
+        self.relations = None
         self.chars = []
         self.player_char = None
         self.day = 1
         self.time_of_day = 300
-        self.interaction_log = ["Welcome to Fantasy Sim!"]
-        self.environment = Environment()
-        self.map_w, self.map_h = MAP_W, MAP_H
+        self.ticks = 0
+        self.interaction_log = InteractionLog(sink=LogSink(LOG_FILE) if LOG_FILE else None)
+        self.interaction_log.append("Welcome to Fantasy Sim!")
+        self.interaction_counts = collections.Counter()  # act type -> conversations this session
+        # Every random choice the simulation makes comes from self.rng, so a seed replays a run exactly.
+        # Fireflies are cosmetic and draw from their own stream.
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.environment = Environment(random.Random(self.rng.getrandbits(64)))
+        self.tilemap = TileMap.load(MAP_FILE) if MAP_FILE else TileMap.from_config()
+        self.map_w, self.map_h = (self.tilemap.width, self.tilemap.height) if MAP_FILE else (MAP_W, MAP_H)
+        self.grid = SpatialGrid()
+        self.scheduler = Scheduler()
+        self.journal = journal.Journal()
+
+    def clock(self):
+        """Monotonic world time: days elapsed times 1200 plus the time of day."""
+        return (self.day - 1) * 1200 + self.time_of_day
     
     def get_char_at(self, pos, radius=20):
-        for char in self.chars:
-            if abs(char.x - pos[0]) < radius and abs(char.y - pos[1]) < radius:
-                return char
-        return None
+        return self.grid.nearest(pos[0], pos[1], radius)
+
+    def nearest_char(self, char, radius):
+        """Closest other character within `radius` of `char`, or None."""
+        return self.grid.nearest(char.x, char.y, radius, exclude=char)
+
+    def any_char_near(self, char, radius):
+        """Some other character within `radius` of `char`, or None: all a chat partner needs."""
+        x, y = self.grid.position(char)
+        return self.grid.any_within(x, y, radius, exclude=char)
 
-    def update(self, game_speed, game_mode):
-        from social import process_interaction
+    def step(self, n_ticks=1, game_speed=1, game_mode="GOD"):
+        """Advances the simulation by a fixed number of ticks, without any rendering."""
+        for _ in range(n_ticks):
+            self.update(game_speed, game_mode)
+        return n_ticks
+
+    def update(self, game_speed, game_mode, view=None):
+        """Advances one tick. `view` is the camera rect in world space, used for level of detail."""
+        self.ticks += 1
         
         # --- TIME UPDATE LOGIC CHANGED HERE ---
         # 1. Check for sleeping (Player near bed)
@@ -56,87 +103,201 @@ class World:
         increment = TIME_SPEED * game_speed
         
         if is_sleeping:
-            increment *= 100  # Speed up time by 100x if sleeping
-        
-        self.time_of_day += increment
+            # Speed up time by 100x if sleeping, jumping NPCs along their schedules to keep up
+            self.scheduler.skip(self, increment * 100, game_speed * 100)
+        else:
+            self.time_of_day += increment
+            if self.time_of_day >= 1200:
+                self.time_of_day = 0
+                self.start_new_day()
         # -------------------------------------
-
-        if self.time_of_day >= 1200:
-            self.time_of_day = 0
-            self.day += 1
-            for c in self.chars:
-                c.roll_daily_routine()
         
         self.environment.update(self.time_of_day)
 
+        self.scheduler.update(self, game_mode, view)
+
+        if self.player_char and game_mode == "NORMAL":
+            # The player is steered by input, not by whatever target the AI left behind
+            self.player_char.target_x, self.player_char.target_y = self.player_char.x, self.player_char.y
+            self.grid.move(self.player_char)
+
+        # At high game speeds NPCs walk proportionally further so they keep up with their schedules
+        self._move_chars(max(1, game_speed))
+
+    def _move_chars(self, scale, lod=True):
+        if self.movement is None:
+            self.scheduler.move(self, scale, lod)
+        else:
+            self.grid.moved(self.movement.move_all(scale))
+
+    def start_new_day(self):
+        self.day += 1
         for c in self.chars:
-            c.update(self, game_mode, process_interaction)
+            c.roll_daily_routine(self.rng)
+        self.journal.mark_day(self)
+
+    def interact(self, actor, target, manual_choice=None):
+        act, line = process_interaction(actor, target, manual_choice, self.rng)
+        self.journal.mark_relationship(actor, target)
+        self.interaction_counts[act] += 1
+        return act, line
+
+    def interact_many(self, pairs):
+        """World.interact for a whole batch of (actor, target) pairs in one pass."""
+        results = process_interactions(pairs, self.relations, self.rng)
+        for (actor, target), (act, _) in zip(pairs, results):
+            self.journal.mark_relationship(actor, target)
+            self.interaction_counts[act] += 1
+        return results
 
-    def create_new(self, player_data):
+    def interact_repeated(self, ai, ti, counts, gen):
+        """counts[k] conversations of character ai[k] with ti[k] (indices into chars), settled at once."""
+        acts = process_repeated(ai, ti, counts, self.relations, gen)
+        self.interaction_counts.update(acts)
+        # Too many relationships change for a journal delta to pay off
+        self.journal.require_full()
+        return sum(acts.values())
+
+    def digest(self):
+        """Hash of everything a save would hold. Equal seeds and inputs must give equal digests."""
+        return hashlib.sha256(savefile.encode(savefile.snapshot(savefile.capture(self)))).hexdigest()[:16]
+
+    def relationship_rows(self):
+        """(i, j, friendship, romance, status) for every relationship between characters of this world."""
+        if self.relations is not None and self.relations.chars == self.chars:
+            yield from self.relations.items()
+            return
+        index = {c.name: i for i, c in enumerate(self.chars)}
+        for i, c in enumerate(self.chars):
+            for other_name, rel in c.relationships.items():
+                j = index.get(other_name)
+                if j is not None: yield i, j, rel.friendship, rel.romance, rel.status
+
+    def set_job(self, char, job):
+        char.job = job
+        char.assign_work_coords()
+        self.journal.mark_job(char)
+
+    def reroll_stats(self, char):
+        char.recalculate_stats(self.rng)
+        self.journal.require_full()  # Stats are not journaled
+
+    def skip(self, span, game_speed=1, log=True):
+        """Advances the world `span` time units (1200 per day) in one call instead of tick by tick.
+
+        Characters jump straight to each schedule destination they would have reached and
+        conversations are sampled from the rate the ticks would have produced.
+        """
+        talks = self.scheduler.skip(self, span, game_speed, conversations=True)
+        # Anyone still walking had the whole span's worth of ticks to get there
+        self._move_chars(span / TIME_SPEED, lod=False)
+        if log:
+            self.interaction_log.append(f"Skipped {span / 50:.1f} hours: {talks} conversations.")
+        return talks
+
+    def skip_until(self, time_of_day, log=True):
+        """Skips to the next occurrence of `time_of_day`, e.g. 300 for 6am."""
+        return self.skip((time_of_day - self.time_of_day) % 1200, log=log)
+
+    def skip_days(self, days, log=True):
+        return self.skip(days * 1200, log=log)
+
+    def speak(self, char, line, log_line):
+        char.say(line)
+        self.scheduler.speaking[char] = None
+        self.interaction_log.append(log_line)
+
+    def _reindex(self):
+        """Rebuilds derived per-character structures after self.chars was replaced."""
+        if self.movement is not None:
+            self.movement.detach()
+            self.movement = None
+        if self.vectorized:
+            self.movement = movement.VectorMovement(self.chars)
+        if self.relations is None or self.relations.chars != self.chars:  # A loaded save brings its own
+            if self.relations is not None:
+                self.relations.detach()
+            self.relations = relations.RelationshipStore(self.chars) if relations.available() else None
+        self.grid = movement.VectorGrid(self.movement) if self.movement is not None else SpatialGrid()
+        self.grid.rebuild(self.chars)
+        self.scheduler.start(self)
+
+    def create_new(self, player_data, population=16, job_openings=JOB_OPENINGS):
         self.chars = []
         self.day = 1
         self.time_of_day = 300
-        self.interaction_log = ["New World Created."]
+        self.ticks = 0
+        self.interaction_log.clear("New World Created.")
+        self.interaction_counts.clear()
         
         names = ["Arin", "Bela", "Cian", "Dora", "Elian", "Fyn", "Gara", "Hux", "Ivy", "Jem", "Kae", "Lorn", "Mika", "Nora", "Odin", "Pia"]
         
-        p = Character(player_data["name"], 800, 600, player_data.get("color", (255, 255, 255)))
+        rng = self.rng
+        p = Character(player_data["name"], 800, 600, player_data.get("color", (255, 255, 255)), rng)
         p.race = RACES[player_data["race_idx"]]
         p.job = JOBS_LIST[player_data["job_idx"]]
         p.mbti = MBTI_TYPES[player_data["mbti_idx"]]
         p.is_player = True
-        p.recalculate_stats()
+        p.recalculate_stats(rng)
         p.bed_coords = BEDS[0]
         p.home_coords = HOUSES[0].center
         p.x, p.y = p.bed_coords
         self.chars.append(p)
         self.player_char = p
 
-        for i, name in enumerate(names):
-            if len(self.chars) >= 16: break
-            c = Character(name, 0, 0, (random.randint(100, 200), random.randint(100, 200), random.randint(100, 200)))
-            bed_idx = i + 1
-            if bed_idx < len(BEDS):
-                c.bed_coords = BEDS[bed_idx]
-                c.home_coords = HOUSES[bed_idx].center if bed_idx < len(HOUSES) else LOCATIONS["INN"].center
-                c.x, c.y = c.bed_coords
-                c.target_x, c.target_y = c.x, c.y
+        for i in range(population - 1):
+            # Names must stay unique: relationships are keyed by them
+            name = names[i % len(names)]
+            if i >= len(names): name = f"{name} {i // len(names) + 1}"
+            c = Character(name, 0, 0, (rng.randint(100, 200), rng.randint(100, 200), rng.randint(100, 200)), rng)
+            bed_idx = (i + 1) % len(BEDS)
+            c.bed_coords = BEDS[bed_idx]
+            if i + 1 >= len(BEDS):
+                # Villagers past the last bed share its building; spread them over the floor
+                room = HOUSES[bed_idx] if bed_idx < len(HOUSES) else LOCATIONS["INN"]
+                c.bed_coords = (rng.randint(room.x + 10, room.right - 10), rng.randint(room.y + 10, room.bottom - 10))
+            c.home_coords = HOUSES[bed_idx].center if bed_idx < len(HOUSES) else LOCATIONS["INN"].center
+            c.x, c.y = c.bed_coords
+            c.target_x, c.target_y = c.x, c.y
             self.chars.append(c)
 
-        job_openings = {"Innkeeper": 2, "Blacksmith": 2, "Scholar": 2, "Guard": 3, "Merchant": 2, "Fisher": 2, "Farmer": 2}
         for job, slots in job_openings.items():
             for _ in range(slots):
                 candidates = [c for c in self.chars if c.job == "Unemployed" and not c.is_player]
                 if not candidates: break
                 best = max(candidates, key=lambda x: x.get_job_suitability(job))
-                best.job = job
+                self.set_job(best, job)
         
         for c in self.chars:
             c.assign_work_coords()
+        self.journal.reset()
+        self._reindex()
 
-    def save(self):
+    def save(self, path=SAVE_PATH, full=False):
+        """Appends a delta to the save's journal, or writes a full snapshot when one is due."""
         if not self.player_char: return
         try:
-            player_idx = self.chars.index(self.player_char)
-            data = {"chars": self.chars, "day": self.day, "time": self.time_of_day, "player_idx": player_idx}
-            with open("savegame.pkl", "wb") as f:
-                pickle.dump(data, f)
+            journal.write(path, self.journal.capture(self, path, full))
             self.interaction_log.append("Game Saved.")
-        except (ValueError, pickle.PicklingError) as e:
+        except (OSError, ValueError, struct.error) as e:
             self.interaction_log.append(f"Save failed: {e}")
 
-    def load(self):
-        if os.path.exists("savegame.pkl"):
-            try:
-                with open("savegame.pkl", "rb") as f:
-                    data = pickle.load(f)
-                self.chars = data["chars"]
-                self.day = data["day"]
-                self.time_of_day = data["time"]
-                self.player_char = self.chars[data["player_idx"]]
-                self.interaction_log.append("Game Loaded.")
-                return True
-            except (IOError, pickle.UnpicklingError, EOFError) as e:
-                self.interaction_log.append(f"Load failed: {e}")
-                return False
-        return False
+    def load(self, path=SAVE_PATH):
+        """Loads a binary save plus its journal, falling back to importing an old pickle save."""
+        if os.path.exists(path):
+            loader = savefile.load
+        elif os.path.exists(LEGACY_SAVE_PATH):
+            loader, path = savefile.load_legacy, LEGACY_SAVE_PATH
+        else:
+            return False
+        try:
+            loader(self, path)
+            self.journal.reset()
+            if loader is savefile.load:
+                self.journal.replay(self, path)
+            self._reindex()
+            self.interaction_log.append("Game Loaded.")
+            return True
+        except (OSError, ValueError, struct.error, zlib.error, pickle.UnpicklingError, EOFError) as e:
+            self.interaction_log.append(f"Load failed: {e}")
+            return False